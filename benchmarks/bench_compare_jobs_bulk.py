@@ -0,0 +1,67 @@
+"""
+Jobs/second for scoring job descriptions against a resume: the old per-job
+encode + cos_sim loop vs. the batched encode + single matrix product.
+
+    python -m benchmarks.bench_compare_jobs_bulk [--sizes 10 100 1000] [--batch-size 64]
+"""
+import argparse
+import random
+import time
+from sentence_transformers import util
+from helpers.shared import get_model
+from helpers.embeddings import encode_texts, cosine_scores
+
+
+WORDS = (
+    "python backend engineer distributed systems react typescript kubernetes data pipelines "
+    "machine learning startup remote senior product ownership api design postgres aws "
+    "mentoring customers growth infrastructure reliability observability testing"
+).split()
+
+
+def fake_description(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(80, 600)))
+
+
+def per_job(resume: str, descriptions: list[str]) -> list[float]:
+    model = get_model()
+    resume_embedding = model.encode(resume, convert_to_tensor=True)
+    return [
+        util.cos_sim(resume_embedding, model.encode(d, convert_to_tensor=True)).item()
+        for d in descriptions
+    ]
+
+
+def batched(resume: str, descriptions: list[str], batch_size: int) -> list[float]:
+    resume_embedding = encode_texts([resume])[0]
+    return cosine_scores(resume_embedding, encode_texts(descriptions, batch_size)).tolist()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    resume = fake_description(rng)
+    get_model().encode("warmup")
+
+    print(f"{'jobs':>6} {'per-job jobs/s':>16} {'batched jobs/s':>16} {'speedup':>8} {'max |diff|':>11}")
+    for n in args.sizes:
+        descriptions = [fake_description(rng) for _ in range(n)]
+
+        start = time.perf_counter()
+        old_scores = per_job(resume, descriptions)
+        old_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        new_scores = batched(resume, descriptions, args.batch_size)
+        new_s = time.perf_counter() - start
+
+        drift = max(abs(a - b) for a, b in zip(old_scores, new_scores))
+        print(f"{n:>6} {n / old_s:>16.1f} {n / new_s:>16.1f} {old_s / new_s:>7.1f}x {drift:>11.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Embedding throughput and event-loop responsiveness under concurrency: many
+coroutines each embedding a few texts, either with their own
+asyncio.to_thread(get_or_encode) call or through the micro-batching
+embedding service.
+
+Loop lag is the worst overshoot of a 10 ms heartbeat task while the requests
+run; it is what a concurrent SSE stream would feel.
+
+    python -m benchmarks.bench_embedding_service [--concurrency 1 8 32] [--texts-per-request 2]
+
+Runs against a throwaway embedding store so every text is a cache miss.
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+os.environ["EMBEDDING_STORE_DIR"] = tempfile.mkdtemp(prefix="bench-embedding-store-")
+
+from helpers.embedding_store import get_embedding_store  # noqa: E402
+from helpers.embedding_service import embedding_service  # noqa: E402
+from helpers.shared import get_model  # noqa: E402
+
+
+WORDS = (
+    "python backend engineer distributed systems react typescript kubernetes data pipelines "
+    "machine learning startup remote senior product ownership api design postgres aws "
+    "mentoring customers growth infrastructure reliability observability testing"
+).split()
+
+
+def fake_texts(rng: random.Random, n: int) -> list[str]:
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(80, 300))) for _ in range(n)]
+
+
+async def heartbeat(stop: asyncio.Event, lag: list[float]):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        lag.append((time.perf_counter() - start - 0.01) * 1000)
+
+
+async def run(mode: str, requests: list[list[str]]) -> tuple[float, float]:
+    async def one(texts: list[str]):
+        if mode == "to_thread":
+            await asyncio.to_thread(get_embedding_store().get_or_encode, texts)
+        else:
+            await embedding_service.embed(texts)
+
+    stop, lag = asyncio.Event(), [0.0]
+    beat = asyncio.create_task(heartbeat(stop, lag))
+    start = time.perf_counter()
+    await asyncio.gather(*(one(texts) for texts in requests))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await beat
+    return sum(len(t) for t in requests) / elapsed, max(lag)
+
+
+async def main_async(args):
+    rng = random.Random(0)
+    get_model().encode(["warmup"], show_progress_bar=False)
+
+    print(f"{'concurrency':>11} {'mode':>10} {'texts/s':>9} {'max loop lag ms':>16}")
+    for concurrency in args.concurrency:
+        for mode in ("to_thread", "service"):
+            # Fresh texts per run so neither mode benefits from the other's cache entries.
+            requests = [fake_texts(rng, args.texts_per_request) for _ in range(concurrency)]
+            throughput, lag = await run(mode, requests)
+            print(f"{concurrency:>11} {mode:>10} {throughput:>9.1f} {lag:>16.1f}")
+    print(embedding_service.stats())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--texts-per-request", type=int, default=2)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Resume PDF extraction: the original read_pdf (string += and seven uncompiled
+re.sub passes) against the new pipeline with each available backend, cold
+and from the content-hash memo.
+
+    python -m benchmarks.bench_read_pdf --dir path/to/resumes [--repeat 3]
+
+Also checks that the PyPDF2 backend still produces exactly the old text.
+"""
+import argparse
+import glob
+import os
+import re
+import statistics
+import time
+from PyPDF2 import PdfReader
+from helpers import read_pdf as pipeline
+
+
+def legacy_read_pdf(file_path):
+    reader = PdfReader(file_path)
+    raw_text = ""
+    for page in reader.pages:
+        text = page.extract_text() or ""
+        raw_text += text
+    clean_text = raw_text
+    clean_text = re.sub(r"[^\x20-\x7E\n]", "", clean_text)
+    clean_text = re.sub(r"[•▪♦·●○‣⁃]", "", clean_text)
+    clean_text = re.sub(r"[^\w\s.,\n]", "", clean_text)
+    clean_text = re.sub(r"[ \t]+", " ", clean_text)
+    clean_text = re.sub(r"\n{2,}", "\n\n", clean_text)
+    clean_text = re.sub(r" +\n", "\n", clean_text)
+    clean_text = clean_text.strip()
+    clean_text = re.sub(r"\n(?=\S)", " ", clean_text)
+    return clean_text
+
+
+def available_backends() -> list[str]:
+    backends = ["pypdf2"]
+    for name, module in (("pdfium", "pypdfium2"), ("fitz", "fitz")):
+        try:
+            __import__(module)
+            backends.append(name)
+        except ImportError:
+            pass
+    return backends
+
+
+def time_ms(fn, repeat: int) -> float:
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - start) * 1000)
+    return statistics.median(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dir", required=True, help="directory of sample resume PDFs")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.dir, "*.pdf")))
+    if not paths:
+        raise SystemExit(f"No PDFs in {args.dir}")
+    corpus = []
+    for path in paths:
+        with open(path, "rb") as f:
+            corpus.append((path, f.read()))
+
+    mismatches = [p for p, data in corpus if legacy_read_pdf(p) != pipeline.read_pdf_bytes(data, "pypdf2")]
+
+    def cold(backend: str):
+        pipeline._cache.clear()
+        for _, data in corpus:
+            pipeline.read_pdf_bytes(data, backend)
+
+    legacy = time_ms(lambda: [legacy_read_pdf(p) for p, _ in corpus], args.repeat)
+    print(f"{len(corpus)} PDFs, median of {args.repeat} runs")
+    print(f"{'variant':>16} {'total ms':>10} {'speedup':>8}")
+    print(f"{'legacy':>16} {legacy:>10.1f} {1.0:>7.1f}x")
+    for backend in available_backends():
+        ms = time_ms(lambda: cold(backend), args.repeat)
+        print(f"{backend + ' cold':>16} {ms:>10.1f} {legacy / ms:>7.1f}x")
+    memo = time_ms(lambda: [pipeline.read_pdf_bytes(d, "pypdf2") for _, d in corpus], args.repeat)
+    print(f"{'memo hit':>16} {memo:>10.2f} {legacy / max(memo, 1e-6):>7.0f}x")
+    print(f"pypdf2 output identical to legacy: {len(corpus) - len(mismatches)}/{len(corpus)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Query latency of the per-agent similarity index against index size, for the
+exact search and the approximate (LSH) mode, with approximate recall@k.
+
+    python -m benchmarks.bench_similarity_index [--sizes 100 1000 10000 100000] [--k 5]
+"""
+import argparse
+import time
+import numpy as np
+import helpers.similarity_index as similarity_index
+from helpers.similarity_index import SimilarityIndex
+
+
+DIM = 384  # all-MiniLM-L6-v2
+
+
+def clustered_vectors(rng: np.random.Generator, n: int) -> np.ndarray:
+    # Job embeddings cluster by role; random centroids plus noise mimic that better than pure noise.
+    centroids = rng.standard_normal((max(1, n // 50), DIM))
+    vectors = centroids[rng.integers(0, len(centroids), n)] + 0.5 * rng.standard_normal((n, DIM))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+def time_queries(index: SimilarityIndex, queries: np.ndarray, k: int, approximate: bool):
+    results = []
+    start = time.perf_counter()
+    for q in queries:
+        results.append(index.search(q, k, min_score=-1.0, approximate=approximate))
+    return (time.perf_counter() - start) / len(queries) * 1000, results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    # Let the approximate path kick in at every size so both modes are measured.
+    similarity_index.APPROX_MIN_SIZE = 0
+    rng = np.random.default_rng(0)
+
+    print(f"{'size':>8} {'build ms':>9} {'exact ms/q':>11} {'approx ms/q':>12} {'recall@k':>9}")
+    for n in args.sizes:
+        vectors = clustered_vectors(rng, n)
+        index = SimilarityIndex(DIM)
+        start = time.perf_counter()
+        index.upsert([f"job-{i}" for i in range(n)], vectors)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        queries = vectors[rng.integers(0, n, args.queries)]
+        exact_ms, exact = time_queries(index, queries, args.k, approximate=False)
+        approx_ms, approx = time_queries(index, queries, args.k, approximate=True)
+        recall = np.mean([
+            len({u for u, _ in a} & {u for u, _ in e}) / max(1, len(e))
+            for a, e in zip(approx, exact)
+        ])
+        print(f"{n:>8} {build_ms:>9.1f} {exact_ms:>11.3f} {approx_ms:>12.3f} {recall:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Cold-start cost of the API process: how long `import server` takes, and what
+the first request pays for each lazily loaded dependency (the same steps the
+startup warmup runs) compared with a second, warm call.
+
+Each run uses a fresh interpreter so nothing is already imported or loaded.
+
+    python -m benchmarks.bench_startup [--runs 3] [--module server]
+
+Importing `server` needs the usual environment (DB_URI, KEK_SECRET, Supabase
+settings, e.g. from .env).
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+
+CHILD = r"""
+import json, sys, time
+start = time.perf_counter()
+__import__(sys.argv[1])
+result = {"import_ms": (time.perf_counter() - start) * 1000, "first_ms": {}, "second_ms": {}}
+
+from helpers.warmup import WARMUP_STEPS
+for name, step in WARMUP_STEPS:
+    for key in ("first_ms", "second_ms"):
+        start = time.perf_counter()
+        try:
+            step()
+            result[key][name] = (time.perf_counter() - start) * 1000
+        except Exception as e:
+            result[key][name] = None
+            result.setdefault("errors", {})[name] = f"{type(e).__name__}: {e}"
+print(json.dumps(result))
+"""
+
+
+def run_once(module: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, module], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def median(values: list) -> str:
+    values = [v for v in values if v is not None]
+    return f"{statistics.median(values):10.0f}" if values else f"{'failed':>10}"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--module", default="server")
+    args = parser.parse_args()
+
+    results = [run_once(args.module) for _ in range(args.runs)]
+
+    print(f"import {args.module}: {median([r['import_ms'] for r in results]).strip()} ms (median of {args.runs})")
+    print(f"{'dependency':>16} {'first ms':>10} {'second ms':>10}")
+    for name in results[0]["first_ms"]:
+        first = median([r["first_ms"][name] for r in results])
+        second = median([r["second_ms"][name] for r in results])
+        print(f"{name:>16} {first} {second}")
+    for name, error in results[-1].get("errors", {}).items():
+        print(f"  {name}: {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Summarization cost per text: the original uncapped sumy LexRank against the
+capped LexRank, the embedding-centrality summarizer and a memo hit, across
+input lengths. Also reports how many of the selected sentences the
+centrality summary shares with the original LexRank one.
+
+    python -m benchmarks.bench_summarize [--sentences 20 100 400] [--summary 10]
+"""
+import argparse
+import random
+import time
+from helpers import summarize
+
+
+WORDS = (
+    "python backend engineer distributed systems react typescript kubernetes data pipelines "
+    "machine learning startup remote senior product ownership api design postgres aws "
+    "mentoring customers growth infrastructure reliability observability testing"
+).split()
+
+
+def fake_text(rng: random.Random, sentences: int) -> str:
+    return " ".join(
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 25))).capitalize() + "."
+        for _ in range(sentences)
+    )
+
+
+def legacy(text: str, num_sentences: int) -> str:
+    from sumy.parsers.plaintext import PlaintextParser
+    from sumy.nlp.tokenizers import Tokenizer
+    from sumy.summarizers.lex_rank import LexRankSummarizer
+
+    parser = PlaintextParser.from_string(text, Tokenizer("english"))
+    summary = LexRankSummarizer()(parser.document, num_sentences)
+    return "\n".join(str(sentence) for sentence in summary)
+
+
+def timed(fn, *args) -> tuple[float, str]:
+    start = time.perf_counter()
+    result = fn(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sentences", type=int, nargs="+", default=[20, 100, 400])
+    parser.add_argument("--summary", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    summarize.ensure_tokenizer_data()
+    summarize.summarize_centrality(fake_text(rng, 20), 3)  # load the embedding model
+
+    print(f"{'sentences':>9} {'legacy ms':>10} {'capped ms':>10} {'centrality ms':>14} {'memo ms':>8} {'overlap':>8}")
+    for n in args.sentences:
+        text = fake_text(rng, n)
+        legacy_ms, legacy_summary = timed(legacy, text, args.summary)
+        capped_ms, _ = timed(summarize.summarize_lexrank, text, args.summary)
+        centrality_ms, centrality_summary = timed(summarize.summarize_centrality, text, args.summary)
+        summarize.summarize_text(text, args.summary)
+        memo_ms, _ = timed(summarize.summarize_text, text, args.summary)
+
+        shared = set(legacy_summary.splitlines()) & set(centrality_summary.splitlines())
+        print(
+            f"{n:>9} {legacy_ms:>10.1f} {capped_ms:>10.1f} {centrality_ms:>14.1f} "
+            f"{memo_ms:>8.3f} {len(shared):>4}/{args.summary}"
+        )
+
+
+if __name__ == "__main__":
+    main()
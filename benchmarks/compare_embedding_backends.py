@@ -0,0 +1,75 @@
+"""
+Accuracy and throughput of the int8 ONNX embedding backend against the
+full-precision PyTorch one.
+
+Reports texts/second for each backend, the cosine between the two backends'
+vectors for the same text, and the drift in resume-vs-job scores, which is what
+decides whether a job clears the similarity threshold.
+
+    python -m benchmarks.compare_embedding_backends [--texts descriptions.txt] [--threads 4]
+
+`--texts` is a file with one job description per line; without it a synthetic
+corpus is used.
+"""
+import argparse
+import random
+import time
+import numpy as np
+from helpers.shared import load_model
+
+
+WORDS = (
+    "python backend engineer distributed systems react typescript kubernetes data pipelines "
+    "machine learning startup remote senior product ownership api design postgres aws "
+    "mentoring customers growth infrastructure reliability observability testing"
+).split()
+
+
+def load_texts(path: str | None, n: int) -> list[str]:
+    if path:
+        with open(path, encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip()]
+    rng = random.Random(0)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(80, 400))) for _ in range(n)]
+
+
+def embed(backend: str, threads: int, texts: list[str], batch_size: int) -> tuple[np.ndarray, float]:
+    model = load_model(backend, threads)
+    model.encode(texts[:2], show_progress_bar=False)  # warm up sessions / kernels
+    start = time.perf_counter()
+    vectors = model.encode(texts, batch_size=batch_size, normalize_embeddings=True, show_progress_bar=False)
+    return np.asarray(vectors, dtype=np.float32), len(texts) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--texts")
+    parser.add_argument("--n", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--threshold", type=float, default=0.4)
+    args = parser.parse_args()
+
+    texts = load_texts(args.texts, args.n)
+    # texts[0] stands in for the resume; the rest are the jobs scored against it.
+    jobs = texts[1:]
+
+    torch_vecs, torch_rate = embed("torch", args.threads, texts, args.batch_size)
+    onnx_vecs, onnx_rate = embed("onnx", args.threads, texts, args.batch_size)
+
+    vector_cos = np.sum(torch_vecs * onnx_vecs, axis=1)
+    torch_scores = torch_vecs[1:] @ torch_vecs[0]
+    onnx_scores = onnx_vecs[1:] @ onnx_vecs[0]
+    score_drift = np.abs(torch_scores - onnx_scores)
+    flips = int(np.sum((torch_scores >= args.threshold) != (onnx_scores >= args.threshold)))
+
+    print(f"texts: {len(texts)}  threads: {args.threads or 'default'}  batch size: {args.batch_size}")
+    print(f"torch: {torch_rate:8.1f} texts/s")
+    print(f"onnx:  {onnx_rate:8.1f} texts/s  ({onnx_rate / torch_rate:.2f}x)")
+    print(f"vector cosine torch vs onnx: min {vector_cos.min():.4f}  mean {vector_cos.mean():.4f}")
+    print(f"resume-vs-job score drift:   max {score_drift.max():.4f}  mean {score_drift.mean():.4f}")
+    print(f"jobs crossing threshold {args.threshold}: {flips} / {len(jobs)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,102 @@
-from playwright.async_api import async_playwright
+import asyncio
+import os
+from typing import Optional
+from playwright.async_api import Page
+from helpers.yc_session import yc_context, goto_authenticated, needs_login
+from helpers.browser_workers import browser_job
 
-async def auto_apply_to_job(job_url: str, username: str, password: str, cover_letter: str):
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context()
+APPLY_MAX_TABS = int(os.environ.get("APPLY_MAX_TABS", "2"))
+
+
+async def _submit_application(page: Page, cover_letter: str):
+    await page.wait_for_selector("text=Apply", timeout=10000)
+    await page.click("text=Apply")
+    await page.wait_for_selector("textarea", timeout=10000)
+    await page.fill("textarea", cover_letter)
+    await page.click("button:has-text('Send')")
+    await page.wait_for_timeout(3000)
+
+
+class LoginFailed(Exception):
+    pass
+
+
+async def _goto_logged_in(page: Page, url: str, agent_id: str, username: str, password: str):
+    """goto_authenticated, then make sure the page really is behind the login."""
+    try:
+        await goto_authenticated(page, url, agent_id, username, password, timeout=10000)
+    except Exception as e:
+        raise LoginFailed(f"Login failed: {e}") from e
+    if await needs_login(page):
+        raise LoginFailed("Login failed: still on the YC login page after signing in.")
+
+
+@browser_job("auto_apply")
+async def auto_apply_to_job(job_url: str, username: str, password: str, cover_letter: str, agent_id: str = ""):
+    async with yc_context(agent_id, profile="ycombinator_apply") as context:
         page = await context.new_page()
 
-        # Block unnecessary resources
-        await page.route("**/*", lambda route, request: (
-            route.abort() if request.resource_type in ["image", "font"] else route.continue_()
-        ))
-
-        # Login
-        await page.goto("https://account.ycombinator.com/?continue=https%3A%2F%2Fwww.workatastartup.com%2F", wait_until="domcontentloaded")
-        await page.fill('input[name="username"]', username)
-        await page.fill('input[name="password"]', password)
-        await page.click('button[type="submit"]')
-        await page.wait_for_timeout(5000)
-
-        # Apply to job
-        await page.goto(job_url, timeout=10000)
-        await page.wait_for_selector("text=Apply", timeout=10000)
-        await page.click("text=Apply")
-        await page.wait_for_selector("textarea", timeout=10000)
-        await page.fill("textarea", cover_letter)
-        await page.click("button:has-text('Send')")
-        await page.wait_for_timeout(3000)
-
-        await browser.close()
+        # Apply to job (logs in only if the stored session is missing or expired)
+        await goto_authenticated(page, job_url, agent_id, username, password, timeout=10000)
+        await _submit_application(page, cover_letter)
+
+
+@browser_job("auto_apply_batch")
+async def auto_apply_to_jobs(
+    jobs: list[tuple[str, str]],
+    username: str,
+    password: str,
+    agent_id: str = "",
+    max_tabs: Optional[int] = None
+) -> tuple[dict[str, Optional[str]], Optional[str]]:
+    """
+    Apply to several (job_url, cover_letter) pairs in one authenticated context.
+
+    Logs in at most once up front, then applies using up to `max_tabs` tabs at a
+    time; a tab that lands on the login page logs in again. Returns (outcomes,
+    login_error): outcomes maps job_url -> None on success or the error message on
+    failure. If the first login fails no job is attempted, outcomes is empty and
+    login_error says why, so the caller can stop instead of retrying the login.
+    """
+    outcomes: dict[str, Optional[str]] = {}
+    if not jobs:
+        return outcomes, None
+
+    async with yc_context(agent_id, profile="ycombinator_apply") as context:
+        # The first job establishes (or validates) the session for the whole context.
+        first_url, first_cover = jobs[0]
+        page = await context.new_page()
+        try:
+            try:
+                await _goto_logged_in(page, first_url, agent_id, username, password)
+            except LoginFailed as e:
+                # Without a session every other tab would fail the same way.
+                return {}, str(e)
+            try:
+                await _submit_application(page, first_cover)
+                outcomes[first_url] = None
+            except Exception as e:
+                outcomes[first_url] = str(e)
+        finally:
+            await page.close()
+
+        tabs = asyncio.Semaphore(max(1, max_tabs or APPLY_MAX_TABS))
+
+        async def apply_one(job_url: str, cover_letter: str):
+            async with tabs:
+                tab = await context.new_page()
+                try:
+                    await tab.goto(job_url, timeout=10000)
+                    # The session can expire mid-batch; log in again for this tab if so.
+                    if await needs_login(tab):
+                        await _goto_logged_in(tab, job_url, agent_id, username, password)
+                    await _submit_application(tab, cover_letter)
+                    outcomes[job_url] = None
+                except Exception as e:
+                    outcomes[job_url] = str(e)
+                finally:
+                    await tab.close()
+
+        await asyncio.gather(*(apply_one(url, cover) for url, cover in jobs[1:]))
+
+    return {url: outcomes.get(url, "Not attempted.") for url, _ in jobs}, None
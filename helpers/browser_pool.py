@@ -0,0 +1,184 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
+from helpers.resource_blocking import apply_blocking_profile, record_blocking_stats
+
+
+BROWSER_POOL_SIZE = int(os.environ.get("BROWSER_POOL_SIZE", "2"))
+BROWSER_CONTEXTS_PER_BROWSER = int(os.environ.get("BROWSER_CONTEXTS_PER_BROWSER", "4"))
+BROWSER_MAX_USES = int(os.environ.get("BROWSER_MAX_USES", "50"))
+
+
+class _PooledBrowser:
+    def __init__(self, browser: Browser):
+        self.browser = browser
+        self.uses = 0
+        self.active = 0
+        self.retired = False
+
+
+class BrowserPool:
+    """
+    Process-wide pool of long-lived Chromium processes.
+
+    Callers get an isolated BrowserContext (or a Page inside one) per checkout.
+    Browsers are recycled after `max_uses` contexts or when they disconnect.
+    """
+
+    def __init__(self, size: int, contexts_per_browser: int, max_uses: int):
+        self.size = max(1, size)
+        self.contexts_per_browser = max(1, contexts_per_browser)
+        self.max_uses = max(1, max_uses)
+        self._playwright: Optional[Playwright] = None
+        self._browsers: list[_PooledBrowser] = []
+        self._lock = asyncio.Lock()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._metrics = {
+            "acquisitions": 0,
+            "waiting": 0,
+            "total_wait_s": 0.0,
+            "max_wait_s": 0.0,
+            "launches": 0,
+            "recycles": 0,
+            "crashes": 0,
+        }
+
+    async def start(self):
+        async with self._lock:
+            if self._playwright is not None:
+                return
+            self._playwright = await async_playwright().start()
+            self._slots = asyncio.Semaphore(self.size * self.contexts_per_browser)
+
+    async def stop(self):
+        async with self._lock:
+            for pooled in self._browsers:
+                await self._close_browser(pooled)
+            self._browsers = []
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+            self._slots = None
+
+    def stats(self) -> dict[str, Any]:
+        acquisitions = self._metrics["acquisitions"]
+        return {
+            **self._metrics,
+            "size": self.size,
+            "contexts_per_browser": self.contexts_per_browser,
+            "max_uses": self.max_uses,
+            "browsers": len(self._browsers),
+            "active_contexts": sum(p.active for p in self._browsers),
+            "avg_wait_s": self._metrics["total_wait_s"] / acquisitions if acquisitions else 0.0,
+        }
+
+    async def _launch(self) -> _PooledBrowser:
+        assert self._playwright is not None
+        browser = await self._playwright.chromium.launch(headless=True)
+        pooled = _PooledBrowser(browser)
+        browser.on("disconnected", lambda _: self._on_disconnected(pooled))
+        self._browsers.append(pooled)
+        self._metrics["launches"] += 1
+        return pooled
+
+    def _on_disconnected(self, pooled: _PooledBrowser):
+        if pooled in self._browsers:
+            self._browsers.remove(pooled)
+            if not pooled.retired:
+                self._metrics["crashes"] += 1
+        pooled.retired = True
+
+    async def _close_browser(self, pooled: _PooledBrowser):
+        pooled.retired = True
+        try:
+            await pooled.browser.close()
+        except Exception:
+            pass
+
+    async def _checkout(self) -> _PooledBrowser:
+        async with self._lock:
+            candidates = [
+                p for p in self._browsers
+                if not p.retired and p.browser.is_connected() and p.active < self.contexts_per_browser
+            ]
+            if candidates:
+                pooled = min(candidates, key=lambda p: p.active)
+            else:
+                pooled = await self._launch()
+
+            pooled.active += 1
+            pooled.uses += 1
+            if pooled.uses >= self.max_uses:
+                # No new contexts go to this browser; it is closed once its last context is released.
+                pooled.retired = True
+                self._browsers.remove(pooled)
+                self._metrics["recycles"] += 1
+            return pooled
+
+    async def _release(self, pooled: _PooledBrowser):
+        async with self._lock:
+            pooled.active -= 1
+            if pooled.retired and pooled.active <= 0:
+                await self._close_browser(pooled)
+
+    @asynccontextmanager
+    async def context(self, profile: Optional[str] = None, **context_kwargs) -> AsyncIterator[BrowserContext]:
+        """
+        Check out an isolated context. `profile` names a resource blocking profile
+        from helpers.resource_blocking to apply to every page in it.
+        """
+        if self._playwright is None:
+            await self.start()
+        assert self._slots is not None
+
+        self._metrics["waiting"] += 1
+        wait_started = time.perf_counter()
+        await self._slots.acquire()
+        waited = time.perf_counter() - wait_started
+        self._metrics["waiting"] -= 1
+        self._metrics["acquisitions"] += 1
+        self._metrics["total_wait_s"] += waited
+        self._metrics["max_wait_s"] = max(self._metrics["max_wait_s"], waited)
+
+        try:
+            pooled = await self._checkout()
+            try:
+                context = await pooled.browser.new_context(**context_kwargs)
+            except Exception:
+                # Browser died between checkout and use: drop it so the next checkout relaunches.
+                self._on_disconnected(pooled)
+                await self._release(pooled)
+                raise
+
+            blocking_stats = None
+            try:
+                if profile:
+                    blocking_stats = await apply_blocking_profile(context, profile)
+                yield context
+            finally:
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+                if blocking_stats is not None:
+                    record_blocking_stats(blocking_stats)
+                if not pooled.browser.is_connected():
+                    self._on_disconnected(pooled)
+                await self._release(pooled)
+        finally:
+            self._slots.release()
+
+    @asynccontextmanager
+    async def page(self, profile: Optional[str] = None, **context_kwargs) -> AsyncIterator[Page]:
+        async with self.context(profile, **context_kwargs) as context:
+            yield await context.new_page()
+
+
+browser_pool = BrowserPool(
+    size=BROWSER_POOL_SIZE,
+    contexts_per_browser=BROWSER_CONTEXTS_PER_BROWSER,
+    max_uses=BROWSER_MAX_USES,
+)
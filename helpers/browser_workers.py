@@ -0,0 +1,316 @@
+import asyncio
+import functools
+import importlib
+import multiprocessing
+import os
+import resource
+import threading
+import uuid
+from typing import Any, Awaitable, Callable, Optional
+
+
+BROWSER_WORKERS = int(os.environ.get("BROWSER_WORKERS", "0"))  # 0 = run browser jobs in the API process
+BROWSER_WORKER_CONCURRENCY = int(os.environ.get("BROWSER_WORKER_CONCURRENCY", "4"))
+BROWSER_WORKER_MAX_JOBS = int(os.environ.get("BROWSER_WORKER_MAX_JOBS", "200"))
+BROWSER_WORKER_MAX_RSS_MB = int(os.environ.get("BROWSER_WORKER_MAX_RSS_MB", "1500"))
+BROWSER_WORKER_JOB_TIMEOUT_S = int(os.environ.get("BROWSER_WORKER_JOB_TIMEOUT_S", "600"))
+
+# Modules whose @browser_job functions a worker process must import to serve jobs.
+_HANDLER_MODULES = [
+    "helpers.scrape_jobs_core",
+    "helpers.remoteok.scrape_jobs_core",
+    "helpers.fetch_desc",
+    "helpers.remoteok.fetch_desc",
+    "helpers.auto_apply_to_job",
+]
+
+JOB_HANDLERS: dict[str, Callable[..., Awaitable[Any]]] = {}
+
+
+def _process_tree_rss_mb(pid: int) -> float:
+    """RSS of `pid` plus all descendants (Playwright driver, Chromium), read from /proc."""
+    try:
+        children: dict[int, list[int]] = {}
+        rss_pages: dict[int, int] = {}
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    fields = f.read().rsplit(")", 1)[1].split()
+                children.setdefault(int(fields[1]), []).append(int(entry))
+                rss_pages[int(entry)] = int(fields[21])
+            except (OSError, IndexError, ValueError):
+                continue
+
+        total, stack = 0, [pid]
+        while stack:
+            current = stack.pop()
+            total += rss_pages.get(current, 0)
+            stack.extend(children.get(current, []))
+        return total * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except OSError:
+        # No /proc (e.g. macOS): fall back to this process's peak RSS.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def _worker_loop(worker_id: int, jobs_q, results_q, concurrency: int, max_jobs: int, max_rss_mb: int):
+    from helpers.browser_pool import browser_pool
+
+    for module in _HANDLER_MODULES:
+        importlib.import_module(module)
+
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(max(1, concurrency))
+    tasks: set[asyncio.Task] = set()
+    accepted = 0
+
+    async def run(job_id: str, kind: str, args: tuple, kwargs: dict):
+        try:
+            result = await JOB_HANDLERS[kind](*args, **kwargs)
+            results_q.put(("done", job_id, worker_id, True, result))
+        except Exception as e:
+            results_q.put(("done", job_id, worker_id, False, f"{type(e).__name__}: {e}"))
+        finally:
+            slots.release()
+
+    await browser_pool.start()
+    try:
+        while True:
+            await slots.acquire()
+            job = await loop.run_in_executor(None, jobs_q.get)
+            if job is None:
+                slots.release()
+                break
+
+            job_id, kind, args, kwargs = job
+            accepted += 1
+            results_q.put(("started", job_id, worker_id, None, None))
+            task = asyncio.create_task(run(job_id, kind, args, kwargs))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+            # Retire after the in-flight jobs finish; the supervisor starts a fresh worker.
+            if accepted >= max_jobs or _process_tree_rss_mb(os.getpid()) > max_rss_mb:
+                break
+
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        # Last message from this worker: anything still queued for it was never started.
+        results_q.put(("exited", None, worker_id, None, os.getpid()))
+    finally:
+        await browser_pool.stop()
+
+
+def _worker_main(worker_id: int, jobs_q, results_q, concurrency: int, max_jobs: int, max_rss_mb: int):
+    from dotenv import load_dotenv
+    load_dotenv()
+    asyncio.run(_worker_loop(worker_id, jobs_q, results_q, concurrency, max_jobs, max_rss_mb))
+
+
+class BrowserWorkerPool:
+    """
+    Supervised pool of worker processes that run browser jobs (scrape, fetch
+    description, apply) off the API event loop. Each job is assigned to the least
+    loaded worker and put on that worker's own queue; results come back as asyncio
+    futures. A worker that dies has every job assigned to it failed as soon as it is
+    reaped, and is restarted. Workers retire themselves after `max_jobs` jobs or when
+    their process tree exceeds `max_rss_mb`; jobs they never started are reassigned.
+    """
+
+    def __init__(self, size: int, concurrency: int, max_jobs: int, max_rss_mb: int, job_timeout_s: int):
+        self.size = size
+        self.concurrency = concurrency
+        self.max_jobs = max_jobs
+        self.max_rss_mb = max_rss_mb
+        self.job_timeout_s = job_timeout_s
+        self.running = False
+        self._mp = multiprocessing.get_context("spawn")
+        self._results_q: Any = None
+        self._workers: dict[int, Any] = {}
+        self._job_queues: dict[int, Any] = {}
+        # Jobs assigned to each worker, from dispatch until their result arrives.
+        self._inflight: dict[int, set[str]] = {}
+        self._retired: set[int] = set()
+        self._exited_cleanly: set[int] = set()
+        self._jobs: dict[str, tuple[str, tuple, dict]] = {}
+        self._started: set[str] = set()
+        self._futures: dict[str, asyncio.Future] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reader: Optional[threading.Thread] = None
+        self._monitor: Optional[asyncio.Task] = None
+        self._metrics = {"submitted": 0, "completed": 0, "failed": 0, "restarts": 0, "crashes": 0}
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self._metrics,
+            "size": self.size,
+            "alive": sum(1 for p in self._workers.values() if p.is_alive()),
+            "pending": len(self._futures),
+        }
+
+    def _spawn(self, worker_id: int):
+        jobs_q = self._mp.Queue()
+        process = self._mp.Process(
+            target=_worker_main,
+            args=(worker_id, jobs_q, self._results_q, self.concurrency, self.max_jobs, self.max_rss_mb),
+            daemon=True,
+        )
+        process.start()
+        self._workers[worker_id] = process
+        self._job_queues[worker_id] = jobs_q
+        self._inflight[worker_id] = set()
+        self._retired.discard(worker_id)
+        self._exited_cleanly.discard(worker_id)
+
+    async def start(self):
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._results_q = self._mp.Queue()
+        for worker_id in range(self.size):
+            self._spawn(worker_id)
+        self.running = True
+        self._reader = threading.Thread(target=self._read_results, daemon=True)
+        self._reader.start()
+        self._monitor = asyncio.create_task(self._supervise())
+
+    async def stop(self):
+        if not self.running:
+            return
+        self.running = False
+        if self._monitor is not None:
+            self._monitor.cancel()
+        for jobs_q in self._job_queues.values():
+            jobs_q.put(None)
+        for process in self._workers.values():
+            await asyncio.to_thread(process.join, 10)
+            if process.is_alive():
+                process.terminate()
+        self._results_q.put(None)
+        for future in self._futures.values():
+            if not future.done():
+                future.set_exception(Exception("Browser worker pool stopped."))
+        self._futures.clear()
+        self._jobs.clear()
+        self._started.clear()
+
+    def _read_results(self):
+        while True:
+            message = self._results_q.get()
+            if message is None:
+                return
+            assert self._loop is not None
+            self._loop.call_soon_threadsafe(self._on_message, message)
+
+    def _dispatch(self, job_id: str):
+        """Assign a job to the least loaded live worker and hand it to that worker's queue."""
+        live = [w for w, p in self._workers.items() if p.is_alive() and w not in self._retired]
+        # With no live worker the job waits on a dead one's queue until the supervisor fails it.
+        worker_id = min(live or self._workers, key=lambda w: len(self._inflight[w]))
+        self._inflight[worker_id].add(job_id)
+        kind, args, kwargs = self._jobs[job_id]
+        self._job_queues[worker_id].put((job_id, kind, args, kwargs))
+
+    def _on_message(self, message: tuple):
+        event, job_id, worker_id, ok, payload = message
+        if event == "started":
+            self._started.add(job_id)
+            return
+        if event == "exited":
+            process = self._workers.get(worker_id)
+            if process is None or process.pid != payload:
+                return
+            # All of this worker's earlier messages have been handled, so jobs it
+            # owns that never started are still unrun and can go to another worker.
+            self._retired.add(worker_id)
+            unstarted = [j for j in self._inflight.get(worker_id, set()) if j not in self._started]
+            for unstarted_id in unstarted:
+                self._inflight[worker_id].discard(unstarted_id)
+                if unstarted_id in self._jobs:
+                    self._dispatch(unstarted_id)
+            return
+
+        self._inflight.get(worker_id, set()).discard(job_id)
+        self._started.discard(job_id)
+        self._jobs.pop(job_id, None)
+        future = self._futures.pop(job_id, None)
+        if future is None or future.done():
+            return
+        if ok:
+            self._metrics["completed"] += 1
+            future.set_result(payload)
+        else:
+            self._metrics["failed"] += 1
+            future.set_exception(Exception(payload))
+
+    def _reap(self):
+        for worker_id, process in list(self._workers.items()):
+            if process.is_alive():
+                continue
+            if process.exitcode == 0 and worker_id not in self._retired and worker_id not in self._exited_cleanly:
+                # Its final "exited" message may still be in the results pipe; look again next tick.
+                self._exited_cleanly.add(worker_id)
+                continue
+            if process.exitcode != 0:
+                self._metrics["crashes"] += 1
+            # Whatever it still owns may have been taken off its queue; never rerun it.
+            for job_id in self._inflight.pop(worker_id, set()):
+                self._started.discard(job_id)
+                self._jobs.pop(job_id, None)
+                future = self._futures.pop(job_id, None)
+                if future is not None and not future.done():
+                    self._metrics["failed"] += 1
+                    future.set_exception(Exception(f"Browser worker {worker_id} exited (code {process.exitcode})."))
+            self._job_queues.pop(worker_id).close()
+            if self.running:
+                self._metrics["restarts"] += 1
+                self._spawn(worker_id)
+
+    async def _supervise(self):
+        while self.running:
+            await asyncio.sleep(1)
+            self._reap()
+
+    async def submit(self, kind: str, args: tuple = (), kwargs: Optional[dict] = None) -> Any:
+        if not self.running:
+            raise Exception("Browser worker pool is not running.")
+        job_id = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._futures[job_id] = future
+        self._jobs[job_id] = (kind, args, kwargs or {})
+        self._metrics["submitted"] += 1
+        self._dispatch(job_id)
+        try:
+            return await asyncio.wait_for(future, timeout=self.job_timeout_s)
+        finally:
+            self._futures.pop(job_id, None)
+            self._jobs.pop(job_id, None)
+
+
+browser_workers = BrowserWorkerPool(
+    size=BROWSER_WORKERS,
+    concurrency=BROWSER_WORKER_CONCURRENCY,
+    max_jobs=BROWSER_WORKER_MAX_JOBS,
+    max_rss_mb=BROWSER_WORKER_MAX_RSS_MB,
+    job_timeout_s=BROWSER_WORKER_JOB_TIMEOUT_S,
+)
+
+
+def browser_job(kind: str):
+    """
+    Register an async browser helper as a worker job. When the worker pool is
+    running in this process, calls are shipped to a worker; otherwise (including
+    inside the workers themselves) the function runs in place.
+    """
+    def decorator(fn: Callable[..., Awaitable[Any]]):
+        JOB_HANDLERS[kind] = fn
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            if browser_workers.running:
+                return await browser_workers.submit(kind, args, kwargs)
+            return await fn(*args, **kwargs)
+
+        return wrapper
+    return decorator
@@ -0,0 +1,91 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+from helpers.embedding_store import normalize_text
+
+
+COVER_LETTER_CACHE_PATH = os.environ.get("COVER_LETTER_CACHE_PATH", "/tmp/cover-letter-cache.sqlite3")
+COVER_LETTER_CACHE_TTL_S = int(os.environ.get("COVER_LETTER_CACHE_TTL_S", str(30 * 24 * 3600)))
+COVER_LETTER_CACHE_MAX_ENTRIES = int(os.environ.get("COVER_LETTER_CACHE_MAX_ENTRIES", "5000"))
+
+cover_letter_cache_counters = {"hits": 0, "misses": 0, "bypassed": 0, "evicted": 0}
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def cache_key(resume_text: str, job_description: str, model_name: str, prompt_version: str) -> str:
+    parts = (text_hash(resume_text), text_hash(job_description), model_name, prompt_version)
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+class CoverLetterCache:
+    """
+    SQLite-backed cover letters shared by every agent and process on the host.
+    Entries expire `ttl_s` after they were generated; beyond `max_entries` the
+    least recently used are evicted. Blocking; call via asyncio.to_thread.
+    """
+
+    def __init__(self, path: str, ttl_s: int, max_entries: int):
+        self.path = path
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._local = threading.local()
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS cover_letters ("
+                " key TEXT PRIMARY KEY, cover_letter TEXT NOT NULL,"
+                " created_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS cover_letters_last_used ON cover_letters (last_used)")
+
+    def _connect(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=10)
+            db.execute("PRAGMA journal_mode=WAL")
+            self._local.db = db
+        return db
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT cover_letter FROM cover_letters WHERE key = ? AND created_at > ?",
+                (key, now - self.ttl_s),
+            ).fetchone()
+            if row is not None:
+                db.execute("UPDATE cover_letters SET last_used = ? WHERE key = ?", (now, key))
+        cover_letter_cache_counters["hits" if row else "misses"] += 1
+        return row[0] if row else None
+
+    def put(self, key: str, cover_letter: str):
+        now = time.time()
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO cover_letters (key, cover_letter, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, cover_letter, now, now),
+            )
+            evicted = db.execute("DELETE FROM cover_letters WHERE created_at <= ?", (now - self.ttl_s,)).rowcount
+            evicted += db.execute(
+                "DELETE FROM cover_letters WHERE key IN ("
+                " SELECT key FROM cover_letters ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+        cover_letter_cache_counters["evicted"] += max(0, evicted)
+
+
+_cache: Optional[CoverLetterCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cover_letter_cache() -> CoverLetterCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = CoverLetterCache(COVER_LETTER_CACHE_PATH, COVER_LETTER_CACHE_TTL_S, COVER_LETTER_CACHE_MAX_ENTRIES)
+        return _cache
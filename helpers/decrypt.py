@@ -2,6 +2,7 @@ import os
 import base64
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 
 def decrypt_aes_key(encrypted_aes_key_hex: str) -> bytes:
@@ -40,3 +41,25 @@ def decrypt_password(encrypted_password_b64: str, aes_key: bytes) -> str:
     pad_len = padded_password[-1]
     password = padded_password[:-pad_len]
     return password.decode("utf-8")
+
+
+def _kek_bytes() -> bytes:
+    kek = os.getenv("KEK_SECRET")
+    if not kek:
+        raise ValueError("KEK_SECRET not found in environment variables.")
+    return bytes.fromhex(kek)
+
+
+def encrypt_with_kek(data: bytes) -> bytes:
+    """
+    Encrypts arbitrary bytes with the KEK using AES-256-GCM (nonce || ciphertext+tag).
+    """
+    nonce = os.urandom(12)
+    return nonce + AESGCM(_kek_bytes()).encrypt(nonce, data, None)
+
+
+def decrypt_with_kek(blob: bytes) -> bytes:
+    """
+    Reverses `encrypt_with_kek`. Raises if the blob was tampered with or the KEK changed.
+    """
+    return AESGCM(_kek_bytes()).decrypt(blob[:12], blob[12:], None)
@@ -0,0 +1,143 @@
+import asyncio
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Optional
+import numpy as np
+from helpers.embedding_store import get_embedding_store, normalize_text
+from helpers.embeddings import encode_texts
+
+
+EMBED_MAX_WAIT_MS = float(os.environ.get("EMBED_MAX_WAIT_MS", "5"))
+EMBED_MAX_BATCH_TEXTS = int(os.environ.get("EMBED_MAX_BATCH_TEXTS", "256"))
+
+# (texts, batch_size, future, persist)
+_Request = tuple[list[str], Optional[int], Future, bool]
+
+
+class EmbeddingService:
+    """
+    Runs every embedding request on one dedicated thread so `model.encode` never
+    blocks the event loop. Requests that arrive within `max_wait_ms` of each other
+    (from any coroutine or thread) are merged into a single store lookup and
+    forward pass, then split back per caller. Requests made with `persist=False`
+    (throwaway texts such as single sentences) skip the shared store.
+    """
+
+    def __init__(self, max_wait_ms: float, max_batch_texts: int):
+        self.max_wait_ms = max_wait_ms
+        self.max_batch_texts = max_batch_texts
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._metrics = {"requests": 0, "texts": 0, "batches": 0, "max_batch_requests": 0, "encode_ms": 0.0}
+
+    def stats(self) -> dict[str, Any]:
+        return {**self._metrics, "queued": self._queue.qsize()}
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="embedding-service", daemon=True)
+                self._thread.start()
+
+    def _take(self, timeout: Optional[float] = None) -> Optional[_Request]:
+        """Next queued request whose caller is still waiting; None on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                return None
+            # Marks the future running so a later cancel cannot race with set_result.
+            if item[2].set_running_or_notify_cancel():
+                return item
+
+    def _next_batch(self) -> list[_Request]:
+        first = self._take()
+        assert first is not None
+        batch = [first]
+        size = len(first[0])
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+        while size < self.max_batch_texts:
+            item = self._take(timeout=deadline - time.monotonic())
+            if item is None:
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _encode_batch(self, batch: list[_Request]):
+        start = time.perf_counter()
+        for persist in (True, False):
+            requests = [item for item in batch if item[3] is persist]
+            if not requests:
+                continue
+            texts = [text for item_texts, _, _, _ in requests for text in item_texts]
+            batch_sizes = [size for _, size, _, _ in requests if size]
+            batch_size = max(batch_sizes) if batch_sizes else None
+            try:
+                if persist:
+                    vectors = get_embedding_store().get_or_encode(texts, batch_size)
+                else:
+                    vectors = encode_texts([normalize_text(t) for t in texts], batch_size)
+            except Exception as e:
+                for _, _, future, _ in requests:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            offset = 0
+            for item_texts, _, future, _ in requests:
+                if not future.done():
+                    future.set_result(vectors[offset:offset + len(item_texts)])
+                offset += len(item_texts)
+
+        self._metrics["batches"] += 1
+        self._metrics["max_batch_requests"] = max(self._metrics["max_batch_requests"], len(batch))
+        self._metrics["encode_ms"] += (time.perf_counter() - start) * 1000
+
+    def _run(self):
+        while True:
+            batch: list[_Request] = []
+            try:
+                batch = self._next_batch()
+                self._encode_batch(batch)
+            except Exception as e:
+                # Never let one bad batch take down the only encoder thread.
+                for _, _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def submit(self, texts: list[str], batch_size: Optional[int] = None, persist: bool = True) -> Future:
+        future: Future = Future()
+        if not texts:
+            future.set_result(np.zeros((0, get_embedding_store().dim), dtype=np.float32))
+            return future
+        self._ensure_started()
+        self._metrics["requests"] += 1
+        self._metrics["texts"] += len(texts)
+        self._queue.put((list(texts), batch_size, future, persist))
+        return future
+
+    async def embed(self, texts: list[str], batch_size: Optional[int] = None, persist: bool = True) -> np.ndarray:
+        """Normalized vectors for `texts`, one row per text in input order."""
+        return await asyncio.wrap_future(self.submit(texts, batch_size, persist))
+
+    def embed_sync(self, texts: list[str], batch_size: Optional[int] = None, persist: bool = True) -> np.ndarray:
+        """Blocking variant for code already running in a worker thread."""
+        return self.submit(texts, batch_size, persist).result()
+
+
+embedding_service = EmbeddingService(max_wait_ms=EMBED_MAX_WAIT_MS, max_batch_texts=EMBED_MAX_BATCH_TEXTS)
+
+
+async def embed_texts(texts: list[str], batch_size: Optional[int] = None) -> np.ndarray:
+    return await embedding_service.embed(texts, batch_size)
@@ -0,0 +1,208 @@
+import fcntl
+import hashlib
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+import numpy as np
+from helpers.embeddings import encode_texts
+from helpers.shared import EMBEDDING_DIM, EMBEDDING_MODEL_ID
+
+
+EMBEDDING_STORE_DIR = os.environ.get("EMBEDDING_STORE_DIR", "/tmp/embedding-store")
+# Rows kept on disk (~1.5 KB each at 384 dims); a full store is compacted to its newest half.
+EMBEDDING_STORE_MAX_ROWS = int(os.environ.get("EMBEDDING_STORE_MAX_ROWS", "200000"))
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    # The tokenizer splits on whitespace anyway, so collapsing it does not change the embedding.
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def content_key(text: str, model_name: str = EMBEDDING_MODEL_ID) -> str:
+    return hashlib.sha256(f"{model_name}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """
+    Content-addressed embedding cache shared by every process on the host.
+
+    Vectors live in one append-only float32 file that is memory-mapped for reads;
+    `index.tsv` maps content keys to row numbers. Appends take an exclusive flock
+    and write vectors before index lines, so any indexed row is always readable.
+    Readers take a shared flock. Once `max_rows` is reached the newest half of the
+    rows is copied into a new generation of both files and the old one is dropped.
+    """
+
+    def __init__(self, root: str, model_name: str, dim: int, max_rows: int = EMBEDDING_STORE_MAX_ROWS):
+        self.model_name = model_name
+        self.dim = dim
+        self.max_rows = max(2, max_rows)
+        self.dir = os.path.join(root, re.sub(r"[^\w.-]+", "_", model_name))
+        os.makedirs(self.dir, exist_ok=True)
+        self.lock_path = os.path.join(self.dir, ".lock")
+        self.generation_path = os.path.join(self.dir, "generation")
+
+        self._generation = -1
+        self._index: dict[str, int] = {}
+        self._index_offset = 0
+        self._matrix: Optional[np.memmap] = None
+        self._mutex = threading.Lock()
+        with self._mutex, self._file_lock(shared=True):
+            self._refresh()
+
+    def _paths(self, generation: int) -> tuple[str, str]:
+        # Generation 0 keeps the original file names.
+        suffix = f".{generation}" if generation else ""
+        return (os.path.join(self.dir, f"vectors{suffix}.f32"), os.path.join(self.dir, f"index{suffix}.tsv"))
+
+    @contextmanager
+    def _file_lock(self, shared: bool = False) -> Iterator[None]:
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _refresh(self):
+        """Follow a compaction by another process, then pick up rows appended since the last read."""
+        try:
+            with open(self.generation_path) as f:
+                generation = int(f.read().strip() or 0)
+        except FileNotFoundError:
+            generation = 0
+        if generation != self._generation:
+            self._generation = generation
+            self.vectors_path, self.index_path = self._paths(generation)
+            for path in (self.vectors_path, self.index_path):
+                open(path, "ab").close()
+            self._index = {}
+            self._index_offset = 0
+            self._matrix = None
+        self._sync_index()
+
+    def _sync_index(self):
+        with open(self.index_path, "rb") as f:
+            f.seek(self._index_offset)
+            chunk = f.read()
+        complete = chunk.rfind(b"\n") + 1
+        for line in chunk[:complete].decode("utf-8").splitlines():
+            key, row = line.split("\t")
+            self._index[key] = int(row)
+        self._index_offset += complete
+
+    def _rows_on_disk(self) -> int:
+        return os.path.getsize(self.vectors_path) // (self.dim * 4)
+
+    def _remap(self):
+        rows = self._rows_on_disk()
+        self._matrix = (
+            np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+            if rows else None
+        )
+
+    def _mapped(self, max_row: int) -> np.memmap:
+        if self._matrix is None or max_row >= self._matrix.shape[0]:
+            self._remap()
+        assert self._matrix is not None
+        return self._matrix
+
+    def _read_rows(self, rows: list[int]) -> np.ndarray:
+        if not rows:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.asarray(self._mapped(max(rows))[rows])
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """Zero-copy view of the stored vector for `text`, or None."""
+        key = content_key(text, self.model_name)
+        with self._mutex, self._file_lock(shared=True):
+            if key not in self._index:
+                self._refresh()
+            row = self._index.get(key)
+            return self._mapped(row)[row] if row is not None else None
+
+    def _compact(self, incoming: int, protect: set[str]):
+        """
+        Start a new generation with the `protect` keys plus the newest other rows, leaving
+        room for `incoming` more below half of `max_rows`. Needs the exclusive lock.
+        """
+        by_row = sorted(self._index.items(), key=lambda item: item[1])
+        others = [item for item in by_row if item[0] not in protect]
+        budget = max(0, self.max_rows // 2 - incoming - (len(by_row) - len(others)))
+        newest = {key for key, _ in others[len(others) - budget:]} if budget else set()
+        keep = [(key, row) for key, row in by_row if key in protect or key in newest]
+
+        generation = self._generation + 1
+        vectors_path, index_path = self._paths(generation)
+        vectors = self._read_rows([row for _, row in keep])
+        with open(vectors_path, "wb") as f:
+            f.write(np.ascontiguousarray(vectors).tobytes())
+        with open(index_path, "w", encoding="utf-8") as f:
+            f.write("".join(f"{key}\t{row}\n" for row, (key, _) in enumerate(keep)))
+
+        tmp_path = f"{self.generation_path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(str(generation))
+        os.replace(tmp_path, self.generation_path)
+        # Readers still holding the old memmap keep their (unlinked) file until they drop it.
+        for path in (self.vectors_path, self.index_path):
+            os.remove(path)
+        self._refresh()
+
+    def _append(self, items: list[tuple[str, np.ndarray]], protect: set[str]):
+        """Write vectors for keys not stored yet, compacting first if full. Needs the exclusive lock."""
+        if self._rows_on_disk() + len(items) > self.max_rows:
+            self._compact(len(items), protect)
+        first_row = self._rows_on_disk()
+        with open(self.vectors_path, "r+b") as f:
+            # Drop any partial row left by a writer that died mid-append.
+            f.truncate(first_row * self.dim * 4)
+            f.seek(0, os.SEEK_END)
+            f.write(np.ascontiguousarray(np.stack([vector for _, vector in items])).tobytes())
+        lines = "".join(f"{key}\t{first_row + n}\n" for n, (key, _) in enumerate(items))
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(lines)
+        self._sync_index()
+
+    def get_or_encode(self, texts: list[str], batch_size: Optional[int] = None) -> np.ndarray:
+        """
+        Vectors for `texts` (input order); only texts never seen before are encoded.
+        The model runs without any lock held, so other threads keep reading meanwhile.
+        """
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        keys = [content_key(t, self.model_name) for t in texts]
+        normalized = dict(zip(keys, (normalize_text(t) for t in texts)))
+
+        while True:
+            with self._mutex, self._file_lock(shared=True):
+                self._refresh()
+                missing = [k for k in normalized if k not in self._index]
+                if not missing:
+                    return self._read_rows([self._index[k] for k in keys])
+
+            vectors = encode_texts([normalized[k] for k in missing], batch_size)
+
+            with self._mutex, self._file_lock():
+                self._refresh()
+                # Another thread or process may have stored some of these meanwhile.
+                fresh = [(k, v) for k, v in zip(missing, vectors) if k not in self._index]
+                if fresh:
+                    self._append(fresh, protect=set(normalized))
+                # Another process's compaction may have evicted rows found above; go round again.
+                if all(k in self._index for k in keys):
+                    return self._read_rows([self._index[k] for k in keys])
+
+
+_store: Optional[EmbeddingStore] = None
+
+
+def get_embedding_store() -> EmbeddingStore:
+    global _store
+    if _store is None:
+        _store = EmbeddingStore(EMBEDDING_STORE_DIR, EMBEDDING_MODEL_ID, EMBEDDING_DIM)
+    return _store
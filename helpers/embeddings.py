@@ -0,0 +1,58 @@
+import os
+import numpy as np
+from helpers.shared import EMBEDDING_DIM, get_model
+
+
+EMBED_BATCH_SIZE = int(os.environ.get("EMBED_BATCH_SIZE", "64"))
+
+
+def encode_texts(texts: list[str], batch_size: int | None = None) -> np.ndarray:
+    """
+    Embed `texts` in one call and return an L2-normalized float32 matrix, one row
+    per text in input order. SentenceTransformer.encode sorts the inputs by length
+    before batching, so each batch pads to similarly sized texts.
+    """
+    if not texts:
+        return np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+    vectors = get_model().encode(
+        texts,
+        batch_size=batch_size or EMBED_BATCH_SIZE,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=False,
+    )
+    return vectors.astype(np.float32, copy=False)
+
+
+def cosine_scores(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """Cosine similarity of one normalized vector against each normalized row of `matrix`."""
+    return matrix @ query
+
+
+def similarity_matrix(vectors: np.ndarray) -> np.ndarray:
+    """Pairwise cosine similarity of normalized rows, as one matrix product."""
+    return vectors @ vectors.T
+
+
+def cluster_by_threshold(matrix: np.ndarray, threshold: float) -> list[list[int]]:
+    """
+    Groups of row indices linked by any pair scoring at least `threshold`
+    (connected components, via union-find). Groups and their members keep input order.
+    """
+    parent = list(range(matrix.shape[0]))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in np.argwhere(np.triu(matrix >= threshold, k=1)).tolist():
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    groups: dict[int, list[int]] = {}
+    for i in range(matrix.shape[0]):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
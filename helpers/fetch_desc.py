@@ -1,19 +1,51 @@
-from playwright.async_api import async_playwright
+from typing import Optional
+from bs4 import BeautifulSoup
+from helpers.browser_pool import browser_pool
+from helpers.http_fetch import DESC_FETCH_MODE, fetch_html, record_fetch
+from helpers.browser_workers import browser_job
 
 
-async def fetch_desc(url: str) -> str:
-    try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            await page.goto(url, timeout=45000)
-            await page.wait_for_timeout(2000)
-            title = await page.locator(".company-title").all_inner_texts()
-            sections = await page.locator(".company-section").all_inner_texts()
-            contents = await page.locator(".prose").all_inner_texts()
-            parts = [f"## {s.strip()}\n{c.strip()}" for s, c in zip(sections, contents)]
-            description = f"# {' '.join(title)}\n\n" + "\n\n".join(parts)
-            await browser.close()
+def format_description(title: list[str], sections: list[str], contents: list[str]) -> str:
+    parts = [f"## {s.strip()}\n{c.strip()}" for s, c in zip(sections, contents)]
+    return f"# {' '.join(title)}\n\n" + "\n\n".join(parts)
+
+
+def parse_desc_html(html: str) -> Optional[str]:
+    """Build the description from server-rendered HTML, or None if the page looks incomplete."""
+    soup = BeautifulSoup(html, "html.parser")
+    # Space-joined like Playwright's inner_text() of the inline title parts.
+    title = [el.get_text(" ", strip=True) for el in soup.select(".company-title")]
+    sections = [el.get_text("\n", strip=True) for el in soup.select(".company-section")]
+    contents = [el.get_text("\n", strip=True) for el in soup.select(".prose")]
+    if not any(title) or not sections or not contents:
+        return None
+    return format_description(title, sections, contents)
+
+
+async def fetch_desc_browser(url: str) -> str:
+    async with browser_pool.page("ycombinator") as page:
+        await page.goto(url, timeout=45000)
+        await page.wait_for_timeout(2000)
+        # Same parser as the HTTP path, so a job's description does not depend on how it was fetched.
+        description = parse_desc_html(await page.content())
+        if description is not None:
             return description
+        title = await page.locator(".company-title").all_inner_texts()
+        sections = await page.locator(".company-section").all_inner_texts()
+        contents = await page.locator(".prose").all_inner_texts()
+        return format_description(title, sections, contents)
+
+
+@browser_job("fetch_desc")
+async def fetch_desc(url: str, mode: Optional[str] = None) -> str:
+    try:
+        if (mode or DESC_FETCH_MODE) == "http":
+            html = await fetch_html(url)
+            description = parse_desc_html(html) if html else None
+            record_fetch("ycombinator", fallback=description is None)
+            if description is not None:
+                return description
+
+        return await fetch_desc_browser(url)
     except Exception as e:
         raise Exception(e)
@@ -0,0 +1,45 @@
+import asyncio
+import os
+from typing import Awaitable, Callable, Optional, Union
+from helpers.fetch_desc import fetch_desc
+from helpers.remoteok.fetch_desc import fetch_desc_remoteok
+
+
+FETCHERS: dict[str, Callable[[str], Awaitable[str]]] = {
+    "ycombinator": fetch_desc,
+    "remoteok": fetch_desc_remoteok,
+}
+
+FETCH_CONCURRENCY = {
+    "ycombinator": int(os.environ.get("YC_FETCH_CONCURRENCY", "4")),
+    "remoteok": int(os.environ.get("REMOTEOK_FETCH_CONCURRENCY", "4")),
+}
+
+
+async def fetch_descs_bulk(
+    urls: list[str],
+    agent_type: str,
+    concurrency: Optional[int] = None
+) -> dict[str, Union[str, Exception]]:
+    """
+    Fetch descriptions for `urls` with at most `concurrency` pages open at once.
+
+    A failing URL does not affect the others: its entry holds the exception instead
+    of a description. The returned dict preserves the order of `urls`.
+    """
+    fetcher = FETCHERS.get(agent_type)
+    if fetcher is None:
+        raise ValueError(f"Unsupported agent type: {agent_type}")
+
+    limit = concurrency or FETCH_CONCURRENCY.get(agent_type, 4)
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def fetch_one(url: str) -> str:
+        async with semaphore:
+            return await fetcher(url)
+
+    results = await asyncio.gather(*(fetch_one(url) for url in urls), return_exceptions=True)
+    return {
+        url: result if isinstance(result, (str, Exception)) else Exception(result)
+        for url, result in zip(urls, results)
+    }
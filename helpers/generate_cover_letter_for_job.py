@@ -1,18 +1,43 @@
+import asyncio
+import os
 from typing import Optional
-from langchain_google_vertexai import ChatVertexAI
-from helpers.summarize import summarize_text
+from langchain_core.language_models import BaseChatModel
+from helpers.llm import get_cover_letter_llm
+from helpers.summarize import SUMMARIZER, summarize_text
+from helpers.rate_limit import call_with_rate_limit
+from helpers.cover_letter_cache import cache_key, cover_letter_cache_counters, get_cover_letter_cache
+
+# Cover letters generated at once by generate_covers_bulk.
+COVER_LETTER_CONCURRENCY = int(os.environ.get("COVER_LETTER_CONCURRENCY", "4"))
+# Bump when the prompt below changes so cached letters from the old prompt are not reused.
+PROMPT_VERSION = "1"
 
 async def generate_cover_letter_for_job(
     job_url: str,
     resume_text: str,
     job_description: str,
-    llm: Optional[ChatVertexAI] = None
+    llm: Optional[BaseChatModel] = None,
+    summarized_resume: Optional[str] = None,
+    force_regenerate: bool = False
 ) -> str:
     if not llm:
-        llm = ChatVertexAI(model="gemini-2.0-flash-lite-001")
+        llm = get_cover_letter_llm()
+
+    # The same resume and description always map to the same letter, whatever the job URL
+    model_name = str(getattr(llm, "model_name", None) or getattr(llm, "model", "") or type(llm).__name__)
+    key = cache_key(resume_text, job_description, model_name, f"{PROMPT_VERSION}:{SUMMARIZER}")
+    cache = await asyncio.to_thread(get_cover_letter_cache)
+    if force_regenerate:
+        cover_letter_cache_counters["bypassed"] += 1
+    else:
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            return cached
 
-    summarized_resume = summarize_text(resume_text, 10)
-    summarized_job = summarize_text(job_description, 10)
+    # Memoized by content hash; off the event loop since a cold summary is CPU-bound
+    if summarized_resume is None:
+        summarized_resume = await asyncio.to_thread(summarize_text, resume_text, 10)
+    summarized_job = await asyncio.to_thread(summarize_text, job_description, 10)
 
     prompt = f"""
     Based on the following resume:
@@ -22,6 +47,7 @@ async def generate_cover_letter_for_job(
     {summarized_job}
     """
 
-    content = llm.invoke(prompt).content
+    content = (await call_with_rate_limit(lambda: llm.ainvoke(prompt))).content
     response = " ".join(str(c) for c in content) if isinstance(content, list) else str(content)
+    await asyncio.to_thread(cache.put, key, response)
     return response
@@ -2,26 +2,11 @@ from dotenv import load_dotenv
 import os
 load_dotenv()
 
-from langchain_google_vertexai import ChatVertexAI
+import functools
+import importlib
 from langgraph.graph import StateGraph, START
 from langgraph.prebuilt import ToolNode
 from utils.types import State
-from tools.scrape_jobs import scrape_jobs
-from tools.fetch_descriptions import fetch_description
-from tools.compare_jobs import compare_job
-from tools.generate_cover import generate_cover
-from tools.auto_apply import auto_apply
-from tools.show_fetched_job_urls import show_fetched_job_urls
-from tools.show_job_descriptions import show_job_descriptions
-from tools.show_job_descriptions_by_index_or_url import show_job_descriptions_by_index_or_url
-from tools.show_top_matches import show_top_matches
-from tools.show_applied_jobs import show_applied_jobs
-from tools.show_cover_letters import show_cover_letters
-from tools.list_available_actions import list_available_actions
-from tools.filter_jobs_by_keyword import filter_jobs_by_keyword
-from tools.compare_jobs_with_each_other import compare_jobs_with_each_other
-from tools.find_similar_jobs import find_similar_jobs
-from tools.show_suitable_jobs import show_suitable_jobs
 from langmem.short_term import SummarizationNode
 from langchain_core.messages.utils import count_tokens_approximately
 from langchain_core.messages import RemoveMessage, BaseMessage, ToolMessage, AIMessage, HumanMessage, SystemMessage
@@ -35,39 +20,38 @@ from typing import Union, Literal
 from langchain_core.messages import BaseMessage, AIMessage
 from pydantic import BaseModel
 import uuid
-from tools.remoteok.scrape_jobs import scrape_jobs_remoteok
-from tools.remoteok.fetch_description import fetch_description_remoteok
 from langchain_core.runnables import RunnableConfig
-from tools.remoteok.auto_apply import auto_apply_remoteok
+from helpers.llm import get_chat_llm
 
+# (module, attribute) pairs; tool modules are imported the first time an agent type needs them.
 common_tools = [
-    compare_job,
-    show_top_matches,
-    generate_cover,
-    show_fetched_job_urls,
-    show_job_descriptions,
-    show_suitable_jobs,
-    show_cover_letters,
-    show_applied_jobs,
-    show_job_descriptions_by_index_or_url,
-    list_available_actions,
-    filter_jobs_by_keyword,
-    compare_jobs_with_each_other,
-    find_similar_jobs
+    ("tools.compare_jobs", "compare_job"),
+    ("tools.show_top_matches", "show_top_matches"),
+    ("tools.generate_cover", "generate_cover"),
+    ("tools.show_fetched_job_urls", "show_fetched_job_urls"),
+    ("tools.show_job_descriptions", "show_job_descriptions"),
+    ("tools.show_suitable_jobs", "show_suitable_jobs"),
+    ("tools.show_cover_letters", "show_cover_letters"),
+    ("tools.show_applied_jobs", "show_applied_jobs"),
+    ("tools.show_job_descriptions_by_index_or_url", "show_job_descriptions_by_index_or_url"),
+    ("tools.list_available_actions", "list_available_actions"),
+    ("tools.filter_jobs_by_keyword", "filter_jobs_by_keyword"),
+    ("tools.compare_jobs_with_each_other", "compare_jobs_with_each_other"),
+    ("tools.find_similar_jobs", "find_similar_jobs"),
 ]
 
 yc_tools = [
     *common_tools,
-    scrape_jobs,
-    fetch_description,
-    auto_apply
+    ("tools.scrape_jobs", "scrape_jobs"),
+    ("tools.fetch_descriptions", "fetch_description"),
+    ("tools.auto_apply", "auto_apply"),
 ]
 
 remoteok_tools = [
     *common_tools,
-    scrape_jobs_remoteok,
-    fetch_description_remoteok,
-    auto_apply_remoteok  
+    ("tools.remoteok.scrape_jobs", "scrape_jobs_remoteok"),
+    ("tools.remoteok.fetch_description", "fetch_description_remoteok"),
+    ("tools.remoteok.auto_apply", "auto_apply_remoteok"),
 ]
 
 TOOL_REGISTRY = {
@@ -75,8 +59,17 @@ TOOL_REGISTRY = {
     "remoteok": remoteok_tools,
 }
 
+@functools.lru_cache(maxsize=None)
+def _load_tools(agent_type: str) -> tuple:
+    specs = TOOL_REGISTRY.get(agent_type, common_tools)
+    return tuple(getattr(importlib.import_module(module), name) for module, name in specs)
+
 def get_tools_for_agent(agent_type: str):
-    return TOOL_REGISTRY.get(agent_type, common_tools)
+    return list(_load_tools(agent_type))
+
+@functools.lru_cache(maxsize=None)
+def _llm_with_tools(agent_type: str):
+    return get_chat_llm().bind_tools(get_tools_for_agent(agent_type))
 
 
 def collect_recent_ai_messages(messages: list) -> dict[str, str]:
@@ -136,7 +129,6 @@ def chatbot_output_condition(
 
 
 
-llm = ChatVertexAI(model="gemini-2.0-flash-001")
 # llm = ChatGroq(model="llama-3.3-70b-versatile", api_key=os.getenv("GROQ_API_KEY"))
 # llm_with_tools = llm.bind_tools(tools)
 
@@ -145,15 +137,17 @@ def filter_messages(state: State) -> dict:
     return {"messages": messages}
 
 
-summarization_model = llm.bind(max_tokens=512)
-summarization_node = SummarizationNode(
-    token_counter=count_tokens_approximately,
-    model=summarization_model,
-    max_tokens=2048,
-    max_tokens_before_summary=1024,
-    max_summary_tokens=256,
-    output_messages_key="messages"
-)
+@functools.lru_cache(maxsize=None)
+def get_summarization_node() -> SummarizationNode:
+    summarization_model = get_chat_llm().bind(max_tokens=512)
+    return SummarizationNode(
+        token_counter=count_tokens_approximately,
+        model=summarization_model,
+        max_tokens=2048,
+        max_tokens_before_summary=1024,
+        max_summary_tokens=256,
+        output_messages_key="messages"
+    )
 
 def drop_unresolved_tool_calls(messages: list[BaseMessage]) -> list[BaseMessage]:
     resolved_ids = {
@@ -180,8 +174,7 @@ def drop_unresolved_tool_calls(messages: list[BaseMessage]) -> list[BaseMessage]
 
 def chatbot(state: State, config: RunnableConfig) -> dict:
     agent_type = config.get("configurable", {}).get("agent_type", "ycombinator")
-    tools = get_tools_for_agent(agent_type)
-    llm_with_tools = llm.bind_tools(tools)
+    llm_with_tools = _llm_with_tools(agent_type)
     raw_messages = drop_unresolved_tool_calls(state.get("messages", []))
     messages = [msg for msg in raw_messages if not isinstance(msg, RemoveMessage)]
     return {"messages": [llm_with_tools.invoke(messages)]}
@@ -234,7 +227,7 @@ async def suggest_followups(state: State) -> dict[str, Any]:
         "last_message": data.get("ai_messages")
     })
 
-    output = llm.invoke(prompt.to_messages())
+    output = get_chat_llm().invoke(prompt.to_messages())
 
     suggestion_msg = AIMessage(
         content="<-- SUGGESTIONS -->\n" + str(output.content).strip(),
@@ -250,7 +243,7 @@ def build_graph(agent_type: str):
     tools = get_tools_for_agent(agent_type)
 
     graph_builder = StateGraph(State)
-    graph_builder.add_node("summarize", summarization_node)
+    graph_builder.add_node("summarize", get_summarization_node())
     graph_builder.add_node("chatbot", chatbot)
     graph_builder.add_node("tools", ToolNode(tools=tools))
     graph_builder.add_node("filter_messages", filter_messages)
@@ -0,0 +1,51 @@
+import os
+from typing import Optional
+import httpx
+
+
+DESC_FETCH_MODE = os.environ.get("DESC_FETCH_MODE", "http")  # "http" (browser fallback) or "browser"
+
+_client: Optional[httpx.AsyncClient] = None
+
+# Per-site counts of pages served over plain HTTP vs. pages that needed Playwright.
+fetch_counters: dict[str, dict[str, int]] = {}
+
+
+def get_http_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=httpx.Timeout(15.0, connect=5.0),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            headers={
+                "User-Agent": (
+                    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+                    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+                ),
+                "Accept": "text/html,application/xhtml+xml",
+            },
+        )
+    return _client
+
+
+async def close_http_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def fetch_html(url: str) -> Optional[str]:
+    try:
+        res = await get_http_client().get(url)
+        if res.status_code != 200:
+            return None
+        return res.text
+    except httpx.HTTPError:
+        return None
+
+
+def record_fetch(site: str, fallback: bool):
+    counters = fetch_counters.setdefault(site, {"http": 0, "fallback": 0})
+    counters["fallback" if fallback else "http"] += 1
@@ -0,0 +1,116 @@
+import asyncio
+import re
+import time
+from typing import Any, Awaitable, Callable, Optional
+from playwright.async_api import Page, Request, TimeoutError as PlaywrightTimeoutError
+
+
+_SNAPSHOT_JS = "(sel) => [document.querySelectorAll(sel).length, document.body.scrollHeight]"
+_GREW_JS = "([sel, n, h]) => document.querySelectorAll(sel).length > n || document.body.scrollHeight > h"
+
+
+# Returns `attr` of every matching element not returned before, tagging them so the
+# next call only sees rows added since. One CDP round trip per call.
+_EXTRACT_NEW_JS = """
+([sel, attr, text]) => {
+    const out = [];
+    for (const el of document.querySelectorAll(sel)) {
+        if (el.hasAttribute("data-jaa-seen")) continue;
+        if (text && !(el.textContent || "").includes(text)) continue;
+        el.setAttribute("data-jaa-seen", "");
+        const value = el.getAttribute(attr);
+        if (value) out.push(value);
+    }
+    return out;
+}
+"""
+
+
+async def extract_new_attrs(page: Page, selector: str, attr: str, text: Optional[str] = None) -> list[str]:
+    """Read `attr` from all `selector` elements added since the previous call, in DOM order."""
+    return await page.evaluate(_EXTRACT_NEW_JS, [selector, attr, text])
+
+
+async def _wait_for_growth(page: Page, item_selector: str, snapshot: list[int], timeout_ms: float) -> bool:
+    try:
+        await page.wait_for_function(_GREW_JS, arg=[item_selector, *snapshot], timeout=timeout_ms)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+async def infinite_scroll(
+    page: Page,
+    item_selector: str,
+    collect: Callable[[], Awaitable[bool]],
+    max_scrolls: int = 30,
+    min_wait_ms: int = 500,
+    max_wait_ms: int = 4000,
+    list_request_pattern: Optional[str] = None,
+) -> dict[str, Any]:
+    """
+    Scroll an infinite list until `collect()` reports it has enough items.
+
+    After every scroll we wait for real signals instead of a fixed sleep: the number
+    of `item_selector` rows (or the page height) going up, or the in-flight list XHR/fetch requests
+    (optionally narrowed by `list_request_pattern`) settling. The wait budget adapts
+    to how quickly the previous batch arrived, bounded by min/max_wait_ms.
+    """
+    stats: dict[str, Any] = {"scrolls": 0, "wait_ms": 0.0, "stopped": "max_scrolls"}
+    pattern = re.compile(list_request_pattern) if list_request_pattern else None
+    inflight: set[Request] = set()
+
+    def is_list_request(request: Request) -> bool:
+        if pattern is not None:
+            return bool(pattern.search(request.url))
+        return request.resource_type in ("xhr", "fetch")
+
+    def on_request(request: Request):
+        if is_list_request(request):
+            inflight.add(request)
+
+    def on_request_done(request: Request):
+        inflight.discard(request)
+
+    page.on("request", on_request)
+    page.on("requestfinished", on_request_done)
+    page.on("requestfailed", on_request_done)
+
+    try:
+        if await collect():
+            stats["stopped"] = "enough"
+            return stats
+
+        timeout_ms: float = max_wait_ms
+        while stats["scrolls"] < max_scrolls:
+            snapshot = await page.evaluate(_SNAPSHOT_JS, item_selector)
+            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            stats["scrolls"] += 1
+
+            started = time.perf_counter()
+            grew = await _wait_for_growth(page, item_selector, snapshot, timeout_ms)
+            if not grew and inflight:
+                # The list request is still running: give it until max_wait_ms to land.
+                deadline = started + max_wait_ms / 1000
+                while inflight and time.perf_counter() < deadline:
+                    await asyncio.sleep(0.05)
+                grew = await page.evaluate(_GREW_JS, [item_selector, *snapshot])
+            waited_ms = (time.perf_counter() - started) * 1000
+            stats["wait_ms"] += waited_ms
+
+            if not grew:
+                stats["stopped"] = "exhausted"
+                break
+
+            timeout_ms = min(max_wait_ms, max(min_wait_ms, waited_ms * 3))
+
+            if await collect():
+                stats["stopped"] = "enough"
+                break
+    finally:
+        page.remove_listener("request", on_request)
+        page.remove_listener("requestfinished", on_request_done)
+        page.remove_listener("requestfailed", on_request_done)
+
+    stats["wait_ms"] = round(stats["wait_ms"], 1)
+    return stats
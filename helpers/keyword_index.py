@@ -0,0 +1,154 @@
+import math
+import re
+import threading
+from typing import Any, Optional
+
+SNIPPET_CHARS = 80
+
+# Words, keeping the punctuation of tech terms: c++, c#, .net, node.js, 5+ (but not a
+# sentence-final period).
+_TOKEN = re.compile(r"(?:(?<![\w.])\.)?\w+(?:\.\w+)*[+#]*")
+# Quoted phrases, the OR operator, or single terms.
+_QUERY_PART = re.compile(r'"([^"]+)"|(\bOR\b)|(\S+)')
+
+
+def _tokenize(text: str) -> list[tuple[str, int, int]]:
+    return [(m.group(0).lower(), m.start(), m.end()) for m in _TOKEN.finditer(text)]
+
+
+def _index_terms(token: str) -> list[str]:
+    """A document token plus the parts of a dotted one, so `node` still finds `node.js`."""
+    if "." not in token:
+        return [token]
+    return [token, *(part for part in token.split(".") if part and part != token)]
+
+
+def parse_query(query: str) -> list[list[list[str]]]:
+    """
+    `a b OR "c d" e` -> [[["a"], ["b"]], [["c", "d"], ["e"]]]: OR-separated clauses of
+    AND-ed terms, each term a token sequence (phrases have several tokens).
+    """
+    clauses: list[list[list[str]]] = [[]]
+    for phrase, or_op, word in _QUERY_PART.findall(query):
+        if or_op:
+            clauses.append([])
+            continue
+        tokens = [t for t, _, _ in _tokenize(phrase or word)]
+        if tokens:
+            clauses[-1].append(tokens)
+    return [clause for clause in clauses if clause]
+
+
+class KeywordIndex:
+    """
+    Positional inverted index over one thread's job descriptions. Documents are
+    re-tokenized only when their description changes, so keeping it in sync with
+    `job_results` costs one string comparison per job.
+    """
+
+    def __init__(self):
+        self.texts: dict[str, str] = {}
+        self._offsets: dict[str, list[tuple[int, int]]] = {}
+        self._postings: dict[str, dict[str, list[int]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def _remove(self, url: str):
+        text = self.texts.pop(url, "")
+        self._offsets.pop(url, None)
+        for token in {term for t, _, _ in _tokenize(text) for term in _index_terms(t)}:
+            docs = self._postings.get(token, {})
+            if docs.pop(url, None) is not None and not docs:
+                del self._postings[token]
+
+    def upsert(self, url: str, text: str):
+        with self._lock:
+            if self.texts.get(url) == text:
+                return
+            if url in self.texts:
+                self._remove(url)
+            if not text:
+                return
+            tokens = _tokenize(text)
+            self.texts[url] = text
+            self._offsets[url] = [(start, end) for _, start, end in tokens]
+            for position, (token, _, _) in enumerate(tokens):
+                for term in _index_terms(token):
+                    self._postings.setdefault(term, {}).setdefault(url, []).append(position)
+
+    def sync(self, job_results: dict[str, Any]):
+        for url, job in job_results.items():
+            description = job.get("description", "")
+            if self.texts.get(url) != description:
+                self.upsert(url, description)
+
+    def _term_positions(self, tokens: list[str]) -> dict[str, list[int]]:
+        """Start positions of a term (single token or phrase) per document."""
+        postings = [self._postings.get(t, {}) for t in tokens]
+        if len(tokens) == 1:
+            return postings[0]
+        matches: dict[str, list[int]] = {}
+        for url in set(postings[0]).intersection(*postings[1:]):
+            starts = set(postings[0][url])
+            for offset, docs in enumerate(postings[1:], start=1):
+                starts &= {p - offset for p in docs[url]}
+                if not starts:
+                    break
+            if starts:
+                matches[url] = sorted(starts)
+        return matches
+
+    def _snippet(self, url: str, position: int, length: int) -> str:
+        text, offsets = self.texts[url], self._offsets[url]
+        start, end = offsets[position][0], offsets[position + length - 1][1]
+        left = max(0, start - SNIPPET_CHARS // 2)
+        right = min(len(text), end + SNIPPET_CHARS // 2)
+        snippet = " ".join(text[left:right].split())
+        return ("…" if left > 0 else "") + snippet + ("…" if right < len(text) else "")
+
+    def search(self, query: str, limit: Optional[int] = None) -> list[dict[str, Any]]:
+        """Matching URLs ranked by tf-idf of the matched terms, each with a snippet."""
+        with self._lock:
+            n_docs = max(1, len(self.texts))
+            scores: dict[str, float] = {}
+            first_hit: dict[str, tuple[int, int]] = {}
+
+            for clause in parse_query(query):
+                term_hits = [(tokens, self._term_positions(tokens)) for tokens in clause]
+                urls = set.intersection(*(set(hits) for _, hits in term_hits))
+                for url in urls:
+                    score = 0.0
+                    for tokens, hits in term_hits:
+                        idf = math.log(1 + n_docs / len(hits))
+                        score += (1 + math.log(len(hits[url]))) * idf
+                    if score > scores.get(url, 0.0):
+                        scores[url] = score
+                        tokens, hits = term_hits[0]
+                        first_hit[url] = (hits[url][0], len(tokens))
+
+            ranked = sorted(scores.items(), key=lambda item: -item[1])[:limit]
+            return [
+                {"url": url, "score": round(score, 3), "snippet": self._snippet(url, *first_hit[url])}
+                for url, score in ranked
+            ]
+
+
+_indexes: dict[str, KeywordIndex] = {}
+
+
+def get_keyword_index(agent_id: str) -> KeywordIndex:
+    index = _indexes.get(agent_id)
+    if index is None:
+        index = _indexes[agent_id] = KeywordIndex()
+    return index
+
+
+def index_descriptions(agent_id: str, descriptions: dict[str, str]):
+    """Hook for code that writes descriptions into `job_results`."""
+    if not agent_id:
+        return
+    index = get_keyword_index(agent_id)
+    for url, description in descriptions.items():
+        index.upsert(url, description)
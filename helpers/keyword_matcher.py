@@ -0,0 +1,80 @@
+import functools
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Iterable
+
+NORMALIZED_CACHE_SIZE = 4096
+
+_WHITESPACE = re.compile(r"\s+")
+_WORD_CHAR = re.compile(r"\w")
+
+_normalized: "OrderedDict[str, tuple[str, str]]" = OrderedDict()
+_normalized_lock = threading.Lock()
+
+
+def normalize_for_matching(text: str) -> str:
+    return _WHITESPACE.sub(" ", text.lower()).strip()
+
+
+def normalized_job_text(job_url: str, text: str) -> str:
+    """Lowered, whitespace-collapsed text for a job, recomputed only when its text changes."""
+    with _normalized_lock:
+        cached = _normalized.get(job_url)
+        if cached is not None and cached[0] == text:
+            _normalized.move_to_end(job_url)
+            return cached[1]
+    normalized = normalize_for_matching(text)
+    with _normalized_lock:
+        _normalized[job_url] = (text, normalized)
+        while len(_normalized) > NORMALIZED_CACHE_SIZE:
+            _normalized.popitem(last=False)
+    return normalized
+
+
+class KeywordMatcher:
+    """
+    Finds which of a fixed set of keywords or phrases occur in a text, in one regex
+    pass. Matches respect word boundaries ("java" does not match "javascript") and
+    phrases match across any whitespace. Texts must be normalized first.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = sorted({normalize_for_matching(k) for k in keywords} - {""}, key=len, reverse=True)
+        # Only one keyword is reported per start position (the longest that fits), so a
+        # match also implies every keyword that is a whole-word prefix of it.
+        self._implied = {
+            k: {p for p in self.keywords if len(p) < len(k) and k.startswith(p) and not _WORD_CHAR.match(k[len(p)])}
+            for k in self.keywords
+        }
+        alternation = "|".join(re.escape(k) for k in self.keywords)
+        self._pattern = re.compile(rf"(?<!\w)(?=({alternation})(?!\w))") if self.keywords else None
+
+    def find(self, normalized_text: str) -> set[str]:
+        found: set[str] = set()
+        if self._pattern is None:
+            return found
+        for match in self._pattern.finditer(normalized_text):
+            keyword = match.group(1)
+            if keyword not in found:
+                found.add(keyword)
+                found |= self._implied[keyword]
+        return found
+
+
+@functools.lru_cache(maxsize=64)
+def get_keyword_matcher(keywords: frozenset[str]) -> KeywordMatcher:
+    return KeywordMatcher(keywords)
+
+
+def fails_title_filter(job: dict[str, Any], title_keywords: frozenset[str]) -> bool:
+    """
+    True when the job's title is known and contains none of `title_keywords`. Titles come
+    from the listing (YC card, RemoteOK feed); jobs without one are never filtered out.
+    """
+    if not title_keywords:
+        return False
+    title = job.get("title")
+    if not title:
+        return False
+    return not get_keyword_matcher(title_keywords).find(normalize_for_matching(title))
@@ -0,0 +1,22 @@
+import functools
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from langchain_google_vertexai import ChatVertexAI
+
+CHAT_MODEL = "gemini-2.0-flash-001"
+COVER_LETTER_MODEL = "gemini-2.0-flash-lite-001"
+
+
+@functools.lru_cache(maxsize=None)
+def get_chat_llm() -> "ChatVertexAI":
+    """Model behind the chat agent, its summarization node and follow-up suggestions."""
+    from langchain_google_vertexai import ChatVertexAI
+    return ChatVertexAI(model=CHAT_MODEL)
+
+
+@functools.lru_cache(maxsize=None)
+def get_cover_letter_llm() -> "ChatVertexAI":
+    from langchain_google_vertexai import ChatVertexAI
+    # Retries are done by helpers.rate_limit so they also wait on the shared token bucket.
+    return ChatVertexAI(model=COVER_LETTER_MODEL, max_retries=0)
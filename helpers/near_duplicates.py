@@ -0,0 +1,108 @@
+import hashlib
+import os
+import re
+import threading
+from typing import Any, Optional
+import numpy as np
+
+
+# Max differing bits (of 64) for two descriptions to count as the same posting.
+SIMHASH_MAX_DISTANCE = int(os.environ.get("SIMHASH_MAX_DISTANCE", "3"))
+SHINGLE_SIZE = 3
+# Too little text to tell a repost from a different role with boilerplate.
+MIN_TOKENS = 20
+
+_TOKEN = re.compile(r"\w+")
+
+# Work avoided because a job was recognised as a copy of one already processed.
+dedup_counters = {"duplicates_found": 0, "embeddings_skipped": 0, "cover_letters_skipped": 0}
+
+
+def simhash(text: str) -> Optional[int]:
+    """64-bit SimHash over word 3-gram shingles, or None for very short texts."""
+    tokens = _TOKEN.findall(text.lower())
+    if len(tokens) < MIN_TOKENS:
+        return None
+    shingles = {" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little") for s in shingles),
+        dtype="<u8",
+        count=len(shingles),
+    )
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    majority = bits.sum(axis=0) * 2 > len(shingles)
+    return int(np.packbits(majority, bitorder="little").view("<u8")[0])
+
+
+class DuplicateIndex:
+    """
+    SimHash signatures of one agent's canonical (first seen) jobs. The 64 bits are
+    split into bands; any signature within `max_distance` bits of a stored one shares
+    at least one band with it as long as there are more bands than allowed bit flips.
+    """
+
+    def __init__(self, max_distance: int = SIMHASH_MAX_DISTANCE):
+        self.max_distance = max_distance
+        self.bands = max_distance + 1
+        self.band_bits = 64 // self.bands
+        self.signatures: dict[str, int] = {}
+        self.checked: dict[str, Optional[str]] = {}
+        self._buckets: list[dict[int, list[str]]] = [{} for _ in range(self.bands)]
+        self._lock = threading.Lock()
+
+    def _band_keys(self, signature: int) -> list[int]:
+        mask = (1 << self.band_bits) - 1
+        return [(signature >> (band * self.band_bits)) & mask for band in range(self.bands)]
+
+    def find(self, signature: int) -> Optional[str]:
+        for band, key in enumerate(self._band_keys(signature)):
+            for url in self._buckets[band].get(key, ()):
+                if bin(self.signatures[url] ^ signature).count("1") <= self.max_distance:
+                    return url
+        return None
+
+    def check(self, url: str, text: str) -> Optional[str]:
+        """URL of the canonical job `text` duplicates, or None (registering `url` as canonical)."""
+        with self._lock:
+            if url in self.checked:
+                return self.checked[url]
+            signature = simhash(text)
+            canonical = self.find(signature) if signature is not None else None
+            if canonical is None and signature is not None:
+                self.signatures[url] = signature
+                for band, key in enumerate(self._band_keys(signature)):
+                    self._buckets[band].setdefault(key, []).append(url)
+            self.checked[url] = canonical
+            return canonical
+
+
+_indexes: dict[str, DuplicateIndex] = {}
+
+
+def get_duplicate_index(agent_id: str) -> DuplicateIndex:
+    index = _indexes.get(agent_id)
+    if index is None:
+        index = _indexes[agent_id] = DuplicateIndex()
+    return index
+
+
+def mark_duplicates(agent_id: str, job_results: dict[str, Any]) -> int:
+    """
+    Set `duplicate_of` on jobs whose description nearly matches an earlier job's.
+    Jobs are considered in `job_results` order, so the first copy stays canonical.
+    Returns how many jobs were newly marked. Blocking; call via asyncio.to_thread.
+    """
+    if not agent_id:
+        return 0
+    index = get_duplicate_index(agent_id)
+    marked = 0
+    for url, job in job_results.items():
+        description = job.get("description", "")
+        if not description or url in index.checked:
+            continue
+        canonical = index.check(url, description)
+        if canonical is not None and job.get("duplicate_of") != canonical:
+            job["duplicate_of"] = canonical
+            marked += 1
+    dedup_counters["duplicates_found"] += marked
+    return marked
@@ -0,0 +1,77 @@
+import asyncio
+import os
+import random
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Requests per minute allowed against Vertex AI for this process, and the burst size.
+VERTEX_RPM = float(os.environ.get("VERTEX_RPM", "60"))
+VERTEX_BURST = int(os.environ.get("VERTEX_BURST", "5"))
+LLM_MAX_ATTEMPTS = int(os.environ.get("LLM_MAX_ATTEMPTS", "5"))
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0):
+        # Waiters queue on the lock, so tokens are handed out in arrival order.
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+
+
+vertex_rate_limiter = TokenBucket(rate=VERTEX_RPM / 60, capacity=VERTEX_BURST)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """
+    429 / quota errors, judged by exception type or status code only: google-api-core's
+    ResourceExhausted / TooManyRequests, or anything with `.code` / `.status_code` 429,
+    also when raised as the cause of a wrapping exception.
+    """
+    seen: set[int] = set()
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        if type(current).__name__ in ("ResourceExhausted", "TooManyRequests"):
+            return True
+        if getattr(current, "code", None) == 429 or getattr(current, "status_code", None) == 429:
+            return True
+        current = current.__cause__
+    return False
+
+
+async def call_with_rate_limit(
+    fn: Callable[[], Awaitable[T]],
+    limiter: TokenBucket = vertex_rate_limiter,
+    max_attempts: int = LLM_MAX_ATTEMPTS,
+    base_delay_s: float = 1.0,
+    max_delay_s: float = 30.0,
+) -> T:
+    """Run `fn` once a token is available, retrying rate-limit errors with jittered backoff."""
+    for attempt in range(max_attempts):
+        await limiter.acquire()
+        try:
+            return await fn()
+        except Exception as e:
+            if not is_rate_limit_error(e) or attempt == max_attempts - 1:
+                raise
+            await asyncio.sleep(random.uniform(0, min(max_delay_s, base_delay_s * 2 ** attempt)))
+    raise RuntimeError("unreachable")
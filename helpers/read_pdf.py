@@ -1,33 +1,116 @@
+import hashlib
+import io
+import multiprocessing
+import os
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
 from PyPDF2 import PdfReader
 
-def read_pdf(file_path):
-    reader = PdfReader(file_path)
-    raw_text = ""
 
-    for page in reader.pages:
-        text = page.extract_text() or ""
-        raw_text += text
+# "pypdf2" (default), "pdfium" (pypdfium2) or "fitz" (PyMuPDF). The native backends
+# are several times faster but optional; missing ones fall back to PyPDF2.
+PDF_BACKEND = os.environ.get("PDF_BACKEND", "pypdf2")
+# PDFs with at least this many pages are split across worker processes (PyPDF2 only).
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("PDF_PARALLEL_MIN_PAGES", "8"))
+PDF_WORKERS = int(os.environ.get("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_CACHE_SIZE = int(os.environ.get("PDF_CACHE_SIZE", "64"))
+
+# Everything except ASCII word characters, space, period, comma and newline. Covers the
+# old non-printable/non-ASCII, bullet and punctuation passes in one.
+_DISALLOWED = re.compile(r"[^A-Za-z0-9_ .,\n]+")
+_SPACES = re.compile(r" {2,}")
+_BLANK_LINES = re.compile(r"\n{2,}")
+_TRAILING_SPACE = re.compile(r" +\n")
+# Collapse single-line sections that were likely headings
+_LINE_BREAK = re.compile(r"\n(?=\S)")
+
+_cache: "OrderedDict[tuple[str, str], str]" = OrderedDict()
+_cache_lock = threading.Lock()
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def clean_text(raw_text: str) -> str:
+    """Aggressive cleaning; same output as the original seven-pass version."""
+    text = _DISALLOWED.sub("", raw_text)
+    text = _SPACES.sub(" ", text)
+    text = _BLANK_LINES.sub("\n\n", text)
+    text = _TRAILING_SPACE.sub("\n", text)
+    return _LINE_BREAK.sub(" ", text.strip())
+
+
+def _extract_pages(data: bytes, start: int, stop: int) -> list[str]:
+    reader = PdfReader(io.BytesIO(data))
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _pages_pypdf2(data: bytes) -> list[str]:
+    reader = PdfReader(io.BytesIO(data))
+    n = len(reader.pages)
+    if n < PDF_PARALLEL_MIN_PAGES or PDF_WORKERS <= 1:
+        return [page.extract_text() or "" for page in reader.pages]
 
-    # Aggressive cleaning
-    clean_text = raw_text
+    chunk = -(-n // PDF_WORKERS)
+    futures = [_get_pool().submit(_extract_pages, data, i, min(i + chunk, n)) for i in range(0, n, chunk)]
+    return [text for future in futures for text in future.result()]
 
-    # Remove non-printable and non-ASCII characters
-    clean_text = re.sub(r"[^\x20-\x7E\n]", "", clean_text)
 
-    # Remove bullet points and common artifacts
-    clean_text = re.sub(r"[•▪♦·●○‣⁃]", "", clean_text)
+def _pages_pdfium(data: bytes) -> list[str]:
+    import pypdfium2 as pdfium
 
-    # Remove all punctuation except periods and commas (optional)
-    clean_text = re.sub(r"[^\w\s.,\n]", "", clean_text)
+    document = pdfium.PdfDocument(data)
+    try:
+        return [page.get_textpage().get_text_range() for page in document]
+    finally:
+        document.close()
 
-    # Normalize multiple spaces and newlines
-    clean_text = re.sub(r"[ \t]+", " ", clean_text)       # multiple spaces -> single space
-    clean_text = re.sub(r"\n{2,}", "\n\n", clean_text)     # multiple newlines -> 2 newlines
-    clean_text = re.sub(r" +\n", "\n", clean_text)         # space before newline -> newline
-    clean_text = clean_text.strip()
 
-    # Collapse single-line sections that were likely headings
-    clean_text = re.sub(r"\n(?=\S)", " ", clean_text)
+def _pages_fitz(data: bytes) -> list[str]:
+    import fitz
 
-    return clean_text
+    with fitz.open(stream=data, filetype="pdf") as document:
+        return [page.get_text() for page in document]
+
+
+_BACKENDS = {"pypdf2": _pages_pypdf2, "pdfium": _pages_pdfium, "fitz": _pages_fitz}
+
+
+def extract_raw_text(data: bytes, backend: str = PDF_BACKEND) -> str:
+    try:
+        pages = _BACKENDS[backend](data)
+    except ImportError:
+        pages = _pages_pypdf2(data)
+    return "".join(pages)
+
+
+def read_pdf_bytes(data: bytes, backend: str = PDF_BACKEND) -> str:
+    """Cleaned text of a PDF, memoized by content hash (and backend)."""
+    key = (hashlib.sha256(data).hexdigest(), backend)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    text = clean_text(extract_raw_text(data, backend))
+
+    with _cache_lock:
+        _cache[key] = text
+        while len(_cache) > PDF_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return text
+
+
+def read_pdf(file_path):
+    with open(file_path, "rb") as f:
+        return read_pdf_bytes(f.read())
@@ -0,0 +1,111 @@
+import os
+import re
+import time
+from typing import Any, Iterable, Optional
+from urllib.parse import urlparse, parse_qs, unquote
+from bs4 import BeautifulSoup
+from helpers.http_fetch import get_http_client
+
+
+REMOTEOK_FEED_URL = "https://remoteok.com/api"
+REMOTEOK_INGEST_MODE = os.environ.get("REMOTEOK_INGEST_MODE", "browser")  # "browser" or "feed"
+REMOTEOK_FEED_TTL_S = int(os.environ.get("REMOTEOK_FEED_TTL_S", "300"))
+
+_feed_cache: dict[str, Any] = {"fetched_at": 0.0, "jobs": {}}
+
+
+def _normalize_tag(tag: str) -> str:
+    return re.sub(r"[\s\-_]+", " ", tag.strip().lower())
+
+
+def tags_from_filter_url(filter_url: str) -> list[str]:
+    """
+    Tags encoded in a RemoteOK listing URL, e.g. /remote-python+react-jobs or /?tags=python,react.
+    """
+    parsed = urlparse(filter_url)
+    tags: list[str] = []
+
+    match = re.match(r"^/remote-(.+)-jobs/?$", unquote(parsed.path))
+    if match:
+        tags.extend(match.group(1).split("+"))
+
+    for value in parse_qs(parsed.query).get("tags", []):
+        tags.extend(value.split(","))
+
+    return [_normalize_tag(t) for t in tags if t.strip()]
+
+
+def job_url_from_item(item: dict[str, Any]) -> str:
+    # Same shape the browser scraper builds from `tr.job[data-url]`.
+    return f"https://remoteok.com/remote-jobs/{item['slug']}"
+
+
+def _description_text(html: str) -> str:
+    return BeautifulSoup(html or "", "html.parser").get_text("\n", strip=True)
+
+
+def parse_feed(payload: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """Map job URL -> feed item, skipping the legal notice RemoteOK puts first."""
+    jobs: dict[str, dict[str, Any]] = {}
+    for item in payload:
+        if not isinstance(item, dict) or not item.get("slug"):
+            continue
+        jobs[job_url_from_item(item)] = {
+            "position": item.get("position", ""),
+            "company": item.get("company", ""),
+            "tags": [_normalize_tag(t) for t in item.get("tags", []) or []],
+            "description": _description_text(item.get("description", "")),
+        }
+    return jobs
+
+
+async def get_feed(force: bool = False) -> dict[str, dict[str, Any]]:
+    if not force and time.time() - _feed_cache["fetched_at"] < REMOTEOK_FEED_TTL_S:
+        return _feed_cache["jobs"]
+
+    res = await get_http_client().get(REMOTEOK_FEED_URL, headers={"Accept": "application/json"})
+    res.raise_for_status()
+    _feed_cache["jobs"] = parse_feed(res.json())
+    _feed_cache["fetched_at"] = time.time()
+    return _feed_cache["jobs"]
+
+
+async def scrape_jobs_from_feed(filter_url: str, existing_urls: Iterable[str], no_jobs: int = 10) -> list[str]:
+    jobs = await get_feed()
+    wanted_tags = tags_from_filter_url(filter_url)
+    seen = set(existing_urls)
+
+    new_urls = []
+    for url, job in jobs.items():
+        if url in seen:
+            continue
+        if wanted_tags and not all(tag in job["tags"] for tag in wanted_tags):
+            continue
+        new_urls.append(url)
+        if len(new_urls) >= no_jobs:
+            break
+    return new_urls
+
+
+async def _feed_or_empty() -> dict[str, dict[str, Any]]:
+    # Lookups below are best effort: jobs scraped from the listing while the feed is
+    # down get their details from the job page instead.
+    try:
+        return await get_feed()
+    except Exception as e:
+        print(f"[remoteok feed] unavailable: {e}")
+        return {}
+
+
+async def feed_descriptions(urls: Iterable[str]) -> dict[str, str]:
+    jobs = await _feed_or_empty()
+    return {url: jobs[url]["description"] for url in urls if url in jobs and jobs[url]["description"]}
+
+
+async def feed_titles(urls: Iterable[str]) -> dict[str, str]:
+    jobs = await _feed_or_empty()
+    return {url: jobs[url]["position"] for url in urls if url in jobs and jobs[url]["position"]}
+
+
+async def fetch_desc_from_feed(url: str) -> Optional[str]:
+    return (await feed_descriptions([url])).get(url)
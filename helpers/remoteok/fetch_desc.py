@@ -1,28 +1,57 @@
-from playwright.async_api import async_playwright
+from typing import Optional
+from bs4 import BeautifulSoup
+from helpers.browser_pool import browser_pool
+from helpers.http_fetch import DESC_FETCH_MODE, fetch_html, record_fetch
+from helpers.remoteok.feed import REMOTEOK_INGEST_MODE, fetch_desc_from_feed
+from helpers.browser_workers import browser_job
 
 
-async def fetch_desc_remoteok(url: str) -> str:
-    try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            await page.goto(url, timeout=45000)
+def parse_desc_html_remoteok(html: str) -> Optional[str]:
+    """Extract the first `.description .html` block, or None if the page looks incomplete."""
+    soup = BeautifulSoup(html, "html.parser")
+    html_block = soup.select_one(".description .html")
+    if html_block is None:
+        return None
+    description = html_block.get_text("\n", strip=True)
+    return description or None
+
+
+async def fetch_desc_remoteok_browser(url: str) -> str:
+    async with browser_pool.page("remoteok") as page:
+        await page.goto(url, timeout=45000)
 
-            # Wait for at least one .html inside .description to load
-            await page.wait_for_selector(".description .html", timeout=10000)
+        # Wait for at least one .html inside .description to load
+        await page.wait_for_selector(".description .html", timeout=10000)
 
-            # Get the first HTML block inside .description
-            html_handle = page.locator(".description .html").first
+        # Get the first HTML block inside .description
+        html_handle = page.locator(".description .html").first
 
-            # Option 1: Get plain text
-            description = await html_handle.inner_text()
+        # Option 1: Get plain text
+        description = await html_handle.inner_text()
 
-            # ✅ Option 2: Get rich HTML content
-            # description = await html_handle.inner_html()
+        # ✅ Option 2: Get rich HTML content
+        # description = await html_handle.inner_html()
 
-            await browser.close()
-            return description.strip()
+        return description.strip()
+
+
+@browser_job("fetch_desc_remoteok")
+async def fetch_desc_remoteok(url: str, mode: Optional[str] = None) -> str:
+    try:
+        if (mode or REMOTEOK_INGEST_MODE) == "feed":
+            # Jobs that have dropped out of the feed fall through to the page fetch below.
+            description = await fetch_desc_from_feed(url)
+            if description:
+                return description
+
+        if (mode or DESC_FETCH_MODE) in ("http", "feed"):
+            html = await fetch_html(url)
+            description = parse_desc_html_remoteok(html) if html else None
+            record_fetch("remoteok", fallback=description is None)
+            if description is not None:
+                return description
+
+        return await fetch_desc_remoteok_browser(url)
 
     except Exception as e:
         raise Exception(f"Error fetching description: {e}")
-
@@ -1,49 +1,49 @@
-from typing import Dict, List
-from playwright.async_api import async_playwright
+from typing import List, Optional
+from helpers.browser_pool import browser_pool
+from helpers.remoteok.feed import REMOTEOK_INGEST_MODE, scrape_jobs_from_feed
+from helpers.infinite_scroll import infinite_scroll, extract_new_attrs
+from helpers.browser_workers import browser_job
 
-async def scrape_jobs_core_remoteok(
-    filter_url: str,
-    existing_urls: List[str],
-    no_jobs: int = 10
-) -> List[str]:
+async def scrape_jobs_remoteok_browser(filter_url: str, existing_urls: List[str], no_jobs: int = 10) -> List[str]:
     new_urls = set()
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context()
-        await context.route("**/*", lambda route, request: (
-            route.abort() if request.resource_type in ["image", "font"] else route.continue_()
-        ))
+    async with browser_pool.context("remoteok") as context:
         page = await context.new_page()
 
         await page.goto(filter_url, timeout=60000)
         await page.wait_for_selector("tr.job[data-url]", timeout=10000)
 
-        scrolls_done = 0
-        max_scrolls = 30
-
-        while len(new_urls) < no_jobs and scrolls_done < max_scrolls:
-            rows = await page.locator("tr.job[data-url]").all()
-
-            for row in rows:
-                url = await row.get_attribute("data-url")
-                if url:
-                    full_url = f"https://remoteok.com{url}" 
-                    if full_url not in existing_urls and full_url not in new_urls:
-                        new_urls.add(full_url)
-                        if len(new_urls) >= no_jobs:
-                            break
+        seen = set(existing_urls)
 
-            prev_height = await page.evaluate("document.body.scrollHeight")
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await page.wait_for_timeout(3000)
-            new_height = await page.evaluate("document.body.scrollHeight")
+        async def collect() -> bool:
+            for url in await extract_new_attrs(page, "tr.job[data-url]", "data-url"):
+                full_url = f"https://remoteok.com{url}" 
+                if full_url not in seen and full_url not in new_urls:
+                    new_urls.add(full_url)
+                    if len(new_urls) >= no_jobs:
+                        break
+            return len(new_urls) >= no_jobs
 
-            scrolls_done += 1
-            if new_height == prev_height:
-                break
-
-        await browser.close()
+        stats = await infinite_scroll(page, "tr.job[data-url]", collect, max_scrolls=30, max_wait_ms=3000)
+        print("[scrape_jobs_core_remoteok] scroll stats: ", stats)
 
     return list(new_urls)
 
+
+@browser_job("scrape_jobs_remoteok")
+async def scrape_jobs_core_remoteok(
+    filter_url: str,
+    existing_urls: List[str],
+    no_jobs: int = 10,
+    mode: Optional[str] = None
+) -> List[str]:
+    if (mode or REMOTEOK_INGEST_MODE) == "feed":
+        # The feed only holds recent postings; scroll the listing when it is down or exhausted.
+        try:
+            new_urls = await scrape_jobs_from_feed(filter_url, existing_urls, no_jobs)
+            if new_urls:
+                return new_urls
+        except Exception as e:
+            print(f"[scrape_jobs_core_remoteok] feed unavailable, scraping the listing: {e}")
+
+    return await scrape_jobs_remoteok_browser(filter_url, existing_urls, no_jobs)
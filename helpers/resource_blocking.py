@@ -0,0 +1,128 @@
+import re
+from typing import Any, Optional
+from urllib.parse import urlparse
+from playwright.async_api import BrowserContext, Route, Request
+
+
+_TRACKER_PATTERNS = [
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+    r"doubleclick\.net",
+    r"facebook\.(net|com)/.*(tr|fbevents)",
+    r"segment\.(io|com)",
+    r"hotjar\.com",
+    r"intercom(cdn)?\.(io|com)",
+    r"mixpanel\.com",
+    r"amplitude\.com",
+    r"sentry\.io",
+    r"clarity\.ms",
+]
+
+# Login pages may challenge with reCAPTCHA, so its hosts stay reachable for YC.
+_YC_DOMAINS = ["ycombinator.com", "workatastartup.com", "google.com", "gstatic.com", "recaptcha.net"]
+
+# resource_types: always aborted. url_patterns: aborted when matched (regex).
+# allowed_domains: if set, requests to any other domain are aborted (documents excepted).
+BLOCKING_PROFILES: dict[str, dict[str, Any]] = {
+    "none": {
+        "resource_types": [],
+        "url_patterns": [],
+        "allowed_domains": None,
+    },
+    "ycombinator": {
+        "resource_types": ["image", "font", "media", "stylesheet"],
+        "url_patterns": _TRACKER_PATTERNS,
+        "allowed_domains": _YC_DOMAINS,
+    },
+    # Applying clicks through a modal, so keep stylesheets to avoid layout-dependent misses.
+    "ycombinator_apply": {
+        "resource_types": ["image", "font", "media"],
+        "url_patterns": _TRACKER_PATTERNS,
+        "allowed_domains": _YC_DOMAINS,
+    },
+    "remoteok": {
+        "resource_types": ["image", "font", "media", "stylesheet"],
+        "url_patterns": _TRACKER_PATTERNS,
+        "allowed_domains": ["remoteok.com", "remoteok.io"],
+    },
+}
+
+# Rough transfer sizes used to estimate what an aborted request would have cost.
+_ESTIMATED_BYTES = {
+    "image": 40_000,
+    "font": 30_000,
+    "media": 500_000,
+    "stylesheet": 20_000,
+    "script": 60_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+}
+
+# Totals per profile across all contexts since process start.
+blocking_totals: dict[str, dict[str, int]] = {}
+
+
+def _domain_allowed(host: str, allowed: list[str]) -> bool:
+    return any(host == d or host.endswith("." + d) for d in allowed)
+
+
+def _block_reason(request: Request, profile: dict[str, Any], pattern: Optional[re.Pattern]) -> Optional[str]:
+    if request.resource_type == "document":
+        return None
+    if request.resource_type in profile["resource_types"]:
+        return "resource_type"
+    if pattern is not None and pattern.search(request.url):
+        return "url_pattern"
+    allowed = profile["allowed_domains"]
+    if allowed is not None:
+        host = urlparse(request.url).hostname or ""
+        if host and not _domain_allowed(host, allowed):
+            return "third_party"
+    return None
+
+
+def _new_counters() -> dict[str, int]:
+    return {"requests_allowed": 0, "requests_blocked": 0, "est_bytes_saved": 0}
+
+
+async def apply_blocking_profile(context: BrowserContext, profile_name: str) -> dict[str, Any]:
+    """
+    Route every request of `context` through the named profile.
+
+    Returns a stats dict that is filled in while the context is used: counters per
+    page (in creation order) plus the blocked-request breakdown by reason.
+    """
+    profile = BLOCKING_PROFILES[profile_name]
+    pattern = re.compile("|".join(profile["url_patterns"])) if profile["url_patterns"] else None
+    stats: dict[str, Any] = {"profile": profile_name, "pages": {}, "blocked_by": {}}
+    page_labels: dict[int, str] = {}
+
+    def counters_for(request: Request) -> dict[str, int]:
+        try:
+            key = id(request.frame.page)
+        except Exception:
+            key = 0  # service worker / detached frame
+        label = page_labels.setdefault(key, f"page-{len(page_labels) + 1}")
+        return stats["pages"].setdefault(label, _new_counters())
+
+    async def handle(route: Route, request: Request):
+        counters = counters_for(request)
+        reason = _block_reason(request, profile, pattern)
+        if reason is None:
+            counters["requests_allowed"] += 1
+            await route.continue_()
+            return
+        counters["requests_blocked"] += 1
+        counters["est_bytes_saved"] += _ESTIMATED_BYTES.get(request.resource_type, 5_000)
+        stats["blocked_by"][reason] = stats["blocked_by"].get(reason, 0) + 1
+        await route.abort()
+
+    await context.route("**/*", handle)
+    return stats
+
+
+def record_blocking_stats(stats: dict[str, Any]):
+    totals = blocking_totals.setdefault(stats["profile"], _new_counters())
+    for counters in stats["pages"].values():
+        for name, value in counters.items():
+            totals[name] += value
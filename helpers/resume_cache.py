@@ -0,0 +1,91 @@
+import hashlib
+import os
+import threading
+import time
+from typing import Any, Optional
+import numpy as np
+from helpers.supabase import supabase
+from helpers.read_pdf import read_pdf_bytes
+from helpers.summarize import summarize_text
+from helpers.embedding_service import embed_texts
+
+
+RESUME_BUCKET = "resumes"
+# How long a resume's storage version is trusted before asking Supabase again.
+RESUME_VERSION_TTL_S = int(os.environ.get("RESUME_VERSION_TTL_S", "30"))
+
+
+class ResumeArtifacts:
+    """Everything derived from one version of a stored resume, computed at most once."""
+
+    def __init__(self, resume_path: str, version: str, data: bytes):
+        self.resume_path = resume_path
+        self.version = version
+        self.data = data
+        self.content_hash = hashlib.sha256(data).hexdigest()
+        self.text = read_pdf_bytes(data)
+        self._summaries: dict[int, str] = {}
+        self._embedding: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    def summary(self, num_sentences: int = 10) -> str:
+        with self._lock:
+            if num_sentences not in self._summaries:
+                self._summaries[num_sentences] = summarize_text(self.text, num_sentences)
+            return self._summaries[num_sentences]
+
+    async def embedding(self) -> np.ndarray:
+        if self._embedding is None:
+            self._embedding = (await embed_texts([self.text]))[0]
+        return self._embedding
+
+
+_artifacts: dict[str, ResumeArtifacts] = {}
+_checked_at: dict[str, float] = {}
+_path_locks: dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def _storage_version(resume_path: str) -> Optional[str]:
+    """ETag (or last update time) of the stored object, without downloading it."""
+    folder, _, name = resume_path.rpartition("/")
+    try:
+        entries: list[dict[str, Any]] = supabase.storage.from_(RESUME_BUCKET).list(folder, {"search": name})
+    except Exception:
+        return None
+    for entry in entries or []:
+        if entry.get("name") == name:
+            metadata = entry.get("metadata") or {}
+            return metadata.get("eTag") or entry.get("updated_at")
+    return None
+
+
+def get_resume_artifacts(resume_path: str) -> ResumeArtifacts:
+    """
+    Cached artifacts for `resume_path`, re-downloaded only when the stored object's
+    version changes. Blocking (Supabase + PDF parsing); call via asyncio.to_thread.
+    """
+    with _locks_guard:
+        path_lock = _path_locks.setdefault(resume_path, threading.Lock())
+
+    with path_lock:
+        cached = _artifacts.get(resume_path)
+        if cached and time.time() - _checked_at.get(resume_path, 0.0) < RESUME_VERSION_TTL_S:
+            return cached
+
+        version = _storage_version(resume_path)
+        if cached and version is not None and version == cached.version:
+            _checked_at[resume_path] = time.time()
+            return cached
+
+        data = supabase.storage.from_(RESUME_BUCKET).download(resume_path)
+        # Without a storage version, fall back to the content hash so unchanged bytes still hit.
+        version = version or hashlib.sha256(data).hexdigest()
+        if cached and version == cached.version:
+            artifacts = cached
+        else:
+            artifacts = ResumeArtifacts(resume_path, version, data)
+
+        _artifacts[resume_path] = artifacts
+        _checked_at[resume_path] = time.time()
+        return artifacts
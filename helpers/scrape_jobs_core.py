@@ -1,53 +1,69 @@
-from typing import Dict, List
-from playwright.async_api import async_playwright
+from typing import Dict, List, Optional
+from helpers.yc_session import yc_context, goto_authenticated
+from helpers.infinite_scroll import infinite_scroll
+from helpers.browser_workers import browser_job
 
+
+# For every "View Job" link not returned before: its href and the job title from the same
+# listing card. WaaS cards link the job twice, once from the title and once from the
+# "View Job" button, so the title is the text of the nearest other link to the same job.
+# Null when the card has no such link. Tags rows like extract_new_attrs.
+_EXTRACT_NEW_JOBS_JS = """
+() => {
+    const out = [];
+    for (const el of document.querySelectorAll("a[href]")) {
+        if (el.hasAttribute("data-jaa-seen")) continue;
+        if (!(el.textContent || "").includes("View Job")) continue;
+        el.setAttribute("data-jaa-seen", "");
+        const href = el.getAttribute("href");
+        const path = new URL(href, location.href).pathname;
+        let title = null;
+        for (let card = el.parentElement; card && card !== document.body && title === null; card = card.parentElement) {
+            if (card.querySelectorAll("a[href*='/jobs/']").length > 2) break;  // left the card
+            for (const link of card.querySelectorAll("a[href]")) {
+                if (link === el || new URL(link.getAttribute("href"), location.href).pathname !== path) continue;
+                const text = (link.textContent || "").replace(/\\s+/g, " ").trim();
+                if (text && !text.includes("View Job")) { title = text; break; }
+            }
+        }
+        out.push([href, title]);
+    }
+    return out;
+}
+"""
+
+
+@browser_job("scrape_jobs")
 async def scrape_jobs_core(
     username: str,
     password: str,
     filter_url: str,
     existing_urls: List[str],
-    no_jobs: int = 10
-) -> List[str]:
-    new_urls = set()
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context()
-        await context.route("**/*", lambda route, request: (
-            route.abort() if request.resource_type in ["image", "font"] else route.continue_()
-        ))
-        page = await context.new_page()
+    no_jobs: int = 10,
+    agent_id: str = ""
+) -> Dict[str, Optional[str]]:
+    """New job URLs in listing order, each mapped to its title from the listing card (None if not found)."""
+    new_jobs: Dict[str, Optional[str]] = {}
 
-        # Log in
-        await page.goto("https://account.ycombinator.com/?continue=https%3A%2F%2Fwww.workatastartup.com%2F", wait_until="domcontentloaded")
-        await page.fill('input[name="username"]', username)
-        await page.fill('input[name="password"]', password)
-        await page.click('button[type="submit"]')
-        await page.wait_for_timeout(5000)
+    async with yc_context(agent_id) as context:
+        page = await context.new_page()
 
-        # Navigate to filtered job page
-        await page.goto(filter_url, timeout=60000)
+        # Navigate to filtered job page (logs in only if the stored session is missing or expired)
+        await goto_authenticated(page, filter_url, agent_id, username, password, timeout=60000)
         await page.wait_for_selector("a:has-text('View Job')", timeout=10000)
 
-        scrolls_done = 0
-        max_scrolls = 30
+        seen = set(existing_urls)
 
-        while len(new_urls) < no_jobs and scrolls_done < max_scrolls:
-            anchors = await page.locator("a:has-text('View Job')").all()
-            for a in anchors:
-                href = await a.get_attribute("href")
-                if href and href not in existing_urls and href not in new_urls:
-                    new_urls.add(href)
-                    if len(new_urls) >= no_jobs:
+        async def collect() -> bool:
+            for href, title in await page.evaluate(_EXTRACT_NEW_JOBS_JS):
+                if href not in seen and href not in new_jobs:
+                    new_jobs[href] = title
+                    if len(new_jobs) >= no_jobs:
                         break
+            return len(new_jobs) >= no_jobs
 
-            prev_height = await page.evaluate("document.body.scrollHeight")
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await page.wait_for_timeout(4000)
-            new_height = await page.evaluate("document.body.scrollHeight")
-            scrolls_done += 1
-            if new_height == prev_height:
-                break
+        # Job links on WaaS point at /jobs/<id>; their count growing means the next batch landed.
+        stats = await infinite_scroll(page, "a[href*='/jobs/']", collect, max_scrolls=30, max_wait_ms=4000)
+        print("[scrape_jobs_core] scroll stats: ", stats)
 
-        await browser.close()
-    return list(new_urls)
+    return new_jobs
@@ -1,6 +1,61 @@
-from sentence_transformers import SentenceTransformer
-from typing import Any
+import os
+import threading
+from typing import TYPE_CHECKING, Optional
 
-resume_text_cache: dict[str, str] = {}
-model = SentenceTransformer("all-MiniLM-L6-v2")
-job_embedding_store: dict[str, Any] = {}
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+EMBEDDING_BACKEND = os.environ.get("EMBEDDING_BACKEND", "torch")  # "torch" or "onnx"
+EMBEDDING_THREADS = int(os.environ.get("EMBEDDING_THREADS", "0"))  # 0 = library default
+# int8 dynamically quantized export shipped in the model repo; pick the file matching the CPU.
+ONNX_MODEL_FILE = os.environ.get("ONNX_MODEL_FILE", "onnx/model_quint8_avx2.onnx")
+
+
+def embedding_model_id(backend: str = EMBEDDING_BACKEND) -> str:
+    """Identifies which vectors a backend produces; quantized vectors differ slightly."""
+    return MODEL_NAME if backend == "torch" else f"{MODEL_NAME}:{backend}:{ONNX_MODEL_FILE}"
+
+
+def load_model(backend: str = EMBEDDING_BACKEND, threads: int = EMBEDDING_THREADS) -> "SentenceTransformer":
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "onnx":
+        import onnxruntime as ort
+
+        session_options = ort.SessionOptions()
+        if threads:
+            session_options.intra_op_num_threads = threads
+        return SentenceTransformer(
+            MODEL_NAME,
+            backend="onnx",
+            model_kwargs={
+                "file_name": ONNX_MODEL_FILE,
+                "provider": "CPUExecutionProvider",
+                "session_options": session_options,
+            },
+        )
+
+    if threads:
+        import torch
+        torch.set_num_threads(threads)
+    return SentenceTransformer(MODEL_NAME)
+
+
+EMBEDDING_MODEL_ID = embedding_model_id()
+# all-MiniLM-L6-v2 output size; lets callers size buffers without loading the model.
+EMBEDDING_DIM = 384
+
+_model: Optional["SentenceTransformer"] = None
+_model_lock = threading.Lock()
+
+
+def get_model() -> "SentenceTransformer":
+    """The process-wide embedding model, loaded on first use (or by the startup warmup)."""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model = load_model()
+    return _model
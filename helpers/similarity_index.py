@@ -0,0 +1,176 @@
+import asyncio
+import os
+import threading
+from typing import Any, Iterable, Optional
+import numpy as np
+from helpers.embedding_store import get_embedding_store, content_key
+from helpers.embedding_service import embedding_service
+
+
+# Below this size the approximate mode just runs the exact search.
+APPROX_MIN_SIZE = int(os.environ.get("SIMILARITY_APPROX_MIN_SIZE", "5000"))
+LSH_TABLES = 8
+LSH_BITS = 8
+
+
+class SimilarityIndex:
+    """
+    Normalized embedding matrix for one agent's jobs, grown in place as
+    descriptions arrive. Exact top-k is one matrix-vector product plus
+    argpartition; the approximate mode narrows candidates with random-hyperplane
+    LSH tables before rescoring them exactly.
+    """
+
+    def __init__(self, dim: int, seed: int = 0):
+        self.dim = dim
+        self.urls: list[str] = []
+        self.rows: dict[str, int] = {}
+        self.keys: dict[str, str] = {}
+        self._matrix = np.zeros((64, dim), dtype=np.float32)
+        self._planes = np.random.default_rng(seed).standard_normal((LSH_TABLES, LSH_BITS, dim)).astype(np.float32)
+        self._bit_weights = 1 << np.arange(LSH_BITS)
+        self._buckets: list[dict[int, list[int]]] = [{} for _ in range(LSH_TABLES)]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return self._matrix[:len(self.urls)]
+
+    def _hashes(self, vectors: np.ndarray) -> np.ndarray:
+        # (tables, n) bucket ids: sign pattern of each vector against each table's planes.
+        bits = np.einsum("tbd,nd->tnb", self._planes, vectors) > 0
+        return bits @ self._bit_weights
+
+    def upsert(self, urls: list[str], vectors: np.ndarray, keys: Optional[list[str]] = None):
+        with self._lock:
+            new_rows = []
+            for i, url in enumerate(urls):
+                row = self.rows.get(url)
+                if row is None:
+                    row = len(self.urls)
+                    if row >= self._matrix.shape[0]:
+                        grown = np.zeros((self._matrix.shape[0] * 2, self.dim), dtype=np.float32)
+                        grown[:row] = self._matrix[:row]
+                        self._matrix = grown
+                    self.urls.append(url)
+                    self.rows[url] = row
+                    new_rows.append(row)
+                self._matrix[row] = vectors[i]
+                if keys is not None:
+                    self.keys[url] = keys[i]
+
+            # Updated vectors keep their old LSH buckets; candidates are always rescored exactly.
+            self._add_to_buckets(new_rows)
+
+    def _add_to_buckets(self, rows: list[int]):
+        if not rows:
+            return
+        hashes = self._hashes(self._matrix[rows])
+        for table, buckets in enumerate(self._buckets):
+            for row, bucket in zip(rows, hashes[table].tolist()):
+                buckets.setdefault(bucket, []).append(row)
+
+    def remove(self, urls: Iterable[str]):
+        """Drop `urls` from the index, compacting the matrix and rebuilding the LSH tables."""
+        with self._lock:
+            dropped = {self.rows[url] for url in urls if url in self.rows}
+            if not dropped:
+                return
+            kept = [row for row in range(len(self.urls)) if row not in dropped]
+            self._matrix[:len(kept)] = self._matrix[kept]
+            self._matrix[len(kept):len(self.urls)] = 0
+            self.urls = [self.urls[row] for row in kept]
+            self.rows = {url: row for row, url in enumerate(self.urls)}
+            self.keys = {url: key for url, key in self.keys.items() if url in self.rows}
+
+            self._buckets = [{} for _ in range(LSH_TABLES)]
+            self._add_to_buckets(list(range(len(self.urls))))
+
+    def _candidates(self, query: np.ndarray) -> np.ndarray:
+        hashes = self._hashes(query[None, :])[:, 0].tolist()
+        rows: set[int] = set()
+        for table, bucket in enumerate(hashes):
+            rows.update(self._buckets[table].get(bucket, ()))
+        return np.fromiter(rows, dtype=np.int64, count=len(rows))
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int = 5,
+        min_score: float = 0.0,
+        exclude: Iterable[str] = (),
+        approximate: bool = False
+    ) -> list[tuple[str, float]]:
+        with self._lock:
+            n = len(self.urls)
+            if n == 0 or k <= 0:
+                return []
+
+            if approximate and n >= APPROX_MIN_SIZE:
+                rows = self._candidates(query)
+                if len(rows) < k:
+                    rows = np.arange(n)
+            else:
+                rows = np.arange(n)
+
+            scores = self._matrix[rows] @ query
+            for url in exclude:
+                row = self.rows.get(url)
+                if row is not None:
+                    scores[rows == row] = -np.inf
+
+            top = min(k, len(rows))
+            best = np.argpartition(-scores, top - 1)[:top]
+            best = best[np.argsort(-scores[best])]
+            return [
+                (self.urls[rows[i]], float(scores[i]))
+                for i in best
+                if scores[i] >= min_score
+            ]
+
+
+_indexes: dict[str, SimilarityIndex] = {}
+
+
+def get_similarity_index(agent_id: str) -> SimilarityIndex:
+    index = _indexes.get(agent_id)
+    if index is None:
+        index = _indexes[agent_id] = SimilarityIndex(get_embedding_store().dim)
+    return index
+
+
+def sync_similarity_index(agent_id: str, job_results: dict[str, Any]) -> SimilarityIndex:
+    """
+    Add or refresh jobs whose description is new or changed since the last sync, and
+    drop jobs that are no longer in `job_results`. Blocking (may embed); call via
+    asyncio.to_thread.
+    """
+    index = get_similarity_index(agent_id)
+    stale = [url for url in index.urls if url not in job_results]
+    if stale:
+        index.remove(stale)
+
+    changed = []
+    for url, job in job_results.items():
+        description = job.get("description", "")
+        if not description:
+            continue
+        key = content_key(description)
+        if index.keys.get(url) != key:
+            changed.append((url, description, key))
+
+    if changed:
+        vectors = embedding_service.embed_sync([desc for _, desc, _ in changed])
+        index.upsert([url for url, _, _ in changed], vectors, [key for _, _, key in changed])
+    return index
+
+
+async def index_embeddings(agent_id: str, urls: list[str], descriptions: list[str], vectors: np.ndarray):
+    """Record embeddings a caller already computed, so later queries skip the sync work."""
+    if not agent_id or not urls:
+        return
+    keys = [content_key(d) for d in descriptions]
+    await asyncio.to_thread(get_similarity_index(agent_id).upsert, urls, vectors, keys)
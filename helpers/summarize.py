@@ -1,11 +1,135 @@
-from sumy.parsers.plaintext import PlaintextParser
-from sumy.nlp.tokenizers import Tokenizer
-from sumy.summarizers.lex_rank import LexRankSummarizer
+import hashlib
+import os
+import threading
+from collections import OrderedDict
 import nltk
-nltk.download('punkt_tab')
+import numpy as np
 
-def summarize_text(text, num_sentences=15):
+# Tokenizer data is installed into this directory by the setup step
+# `python -m helpers.summarize` (see README) and only ever read at runtime.
+NLTK_DATA_DIR = os.environ.get(
+    "NLTK_DATA_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "nltk_data")
+)
+if NLTK_DATA_DIR not in nltk.data.path:
+    nltk.data.path.insert(0, NLTK_DATA_DIR)
+
+# "lexrank" (sumy, TF-IDF graph) or "centrality" (LexRank over sentence embeddings).
+SUMMARIZER = os.environ.get("SUMMARIZER", "lexrank")
+# Sentences beyond this are dropped before the O(n^2) similarity step.
+SUMMARY_MAX_SENTENCES = int(os.environ.get("SUMMARY_MAX_SENTENCES", "120"))
+SUMMARY_CACHE_SIZE = int(os.environ.get("SUMMARY_CACHE_SIZE", "512"))
+
+_tokenizer_ready = False
+_tokenizer_lock = threading.Lock()
+_cache: "OrderedDict[tuple[str, int, str], str]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+class TokenizerDataMissing(RuntimeError):
+    pass
+
+
+def download_tokenizer_data():
+    """Setup step: fetch punkt_tab into NLTK_DATA_DIR. Never called while serving."""
+    if not nltk.download("punkt_tab", download_dir=NLTK_DATA_DIR, quiet=True):
+        raise TokenizerDataMissing(f"Downloading NLTK punkt_tab into {NLTK_DATA_DIR} failed")
+
+
+def ensure_tokenizer_data():
+    """Check that punkt_tab is installed; raises TokenizerDataMissing instead of downloading it."""
+    global _tokenizer_ready
+    if _tokenizer_ready:
+        return
+    with _tokenizer_lock:
+        if _tokenizer_ready:
+            return
+        try:
+            nltk.data.find("tokenizers/punkt_tab/english/")
+        except LookupError:
+            raise TokenizerDataMissing(
+                f"NLTK punkt_tab tokenizer data not found (looked in {NLTK_DATA_DIR} and the default NLTK paths). "
+                "Install it with `python -m helpers.summarize` before starting the server."
+            ) from None
+        _tokenizer_ready = True
+
+
+def split_sentences(text: str) -> list[str]:
+    ensure_tokenizer_data()
+    return [s.strip() for s in nltk.tokenize.sent_tokenize(text, "english") if s.strip()]
+
+
+def _cap_input(text: str, sentences: list[str]) -> str:
+    if len(sentences) <= SUMMARY_MAX_SENTENCES:
+        return text
+    return "\n".join(sentences[:SUMMARY_MAX_SENTENCES])
+
+
+def summarize_lexrank(text: str, num_sentences: int) -> str:
+    from sumy.parsers.plaintext import PlaintextParser
+    from sumy.nlp.tokenizers import Tokenizer
+    from sumy.summarizers.lex_rank import LexRankSummarizer
+
+    text = _cap_input(text, split_sentences(text))
     parser = PlaintextParser.from_string(text, Tokenizer("english"))
     summarizer = LexRankSummarizer()
     summary = summarizer(parser.document, num_sentences)
-    return "\n".join(str(sentence) for sentence in summary)
\ No newline at end of file
+    return "\n".join(str(sentence) for sentence in summary)
+
+
+def summarize_centrality(text: str, num_sentences: int, threshold: float = 0.3, damping: float = 0.85) -> str:
+    """
+    LexRank on embedding cosine similarity: one matrix product for the graph and a
+    vectorized power iteration for the scores. Sentence vectors are batched with
+    other embedding requests but not persisted; the summary itself is memoized by
+    summarize_text. Blocking; call via asyncio.to_thread.
+    """
+    from helpers.embedding_service import embedding_service
+
+    sentences = split_sentences(text)[:SUMMARY_MAX_SENTENCES]
+    if num_sentences <= 0:
+        return ""
+    if len(sentences) <= num_sentences:
+        return "\n".join(sentences)
+
+    vectors = embedding_service.embed_sync(sentences, persist=False)
+    adjacency = (vectors @ vectors.T >= threshold).astype(np.float32)
+    transition = adjacency / adjacency.sum(axis=1, keepdims=True)
+
+    n = len(sentences)
+    scores = np.full(n, 1.0 / n, dtype=np.float32)
+    for _ in range(100):
+        updated = (1 - damping) / n + damping * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < 1e-6:
+            scores = updated
+            break
+        scores = updated
+
+    best = np.sort(np.argpartition(-scores, num_sentences - 1)[:num_sentences])
+    return "\n".join(sentences[i] for i in best)
+
+
+_SUMMARIZERS = {"lexrank": summarize_lexrank, "centrality": summarize_centrality}
+
+
+def summarize_text(text, num_sentences=15, summarizer=None):
+    """Extractive summary, memoized by (content hash, sentence count, summarizer)."""
+    summarizer = summarizer or SUMMARIZER
+    key = (hashlib.sha256(text.encode("utf-8")).hexdigest(), num_sentences, summarizer)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    summary = _SUMMARIZERS[summarizer](text, num_sentences)
+
+    with _cache_lock:
+        _cache[key] = summary
+        while len(_cache) > SUMMARY_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return summary
+
+
+if __name__ == "__main__":
+    download_tokenizer_data()
+    ensure_tokenizer_data()
+    print(f"punkt_tab available under {NLTK_DATA_DIR}")
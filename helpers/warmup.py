@@ -0,0 +1,55 @@
+import os
+import time
+from typing import Any, Callable
+
+# "background": serve immediately and warm up in a thread; "blocking": warm up before
+# accepting traffic; "off": load everything on first use.
+WARMUP_MODE = os.environ.get("WARMUP_MODE", "background")
+
+warmup_stats: dict[str, Any] = {"mode": WARMUP_MODE, "done": False, "steps": {}}
+
+
+def _load_embedding_model():
+    from helpers.shared import get_model
+    get_model().encode(["warmup"], show_progress_bar=False)
+
+
+def _load_tokenizer_data():
+    from helpers.summarize import ensure_tokenizer_data
+    ensure_tokenizer_data()
+
+
+def _load_llms():
+    from helpers.llm import get_chat_llm, get_cover_letter_llm
+    get_chat_llm()
+    get_cover_letter_llm()
+
+
+def _load_tools():
+    from helpers.graph import TOOL_REGISTRY, get_tools_for_agent
+    for agent_type in TOOL_REGISTRY:
+        get_tools_for_agent(agent_type)
+
+
+WARMUP_STEPS: list[tuple[str, Callable[[], None]]] = [
+    ("tools", _load_tools),
+    ("tokenizer_data", _load_tokenizer_data),
+    ("embedding_model", _load_embedding_model),
+    ("llms", _load_llms),
+]
+
+
+def warmup():
+    """
+    Load the lazily initialized dependencies ahead of the first request. Blocking;
+    run via asyncio.to_thread. A failing step is recorded and retried on first use.
+    """
+    for name, step in WARMUP_STEPS:
+        start = time.perf_counter()
+        try:
+            step()
+            warmup_stats["steps"][name] = {"ok": True, "ms": round((time.perf_counter() - start) * 1000)}
+        except Exception as e:
+            warmup_stats["steps"][name] = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            print(f"[warmup] {name} FAILED: {type(e).__name__}: {e}")
+    warmup_stats["done"] = True
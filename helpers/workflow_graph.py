@@ -2,29 +2,31 @@ from langgraph.graph import StateGraph, START
 from utils.types import State
 from langgraph.graph import StateGraph, END
 from langchain_core.runnables import RunnableConfig
-from tools.scrape_jobs import scrape_jobs
-from langgraph.prebuilt import ToolNode
 from helpers.supabase import supabase
-from helpers.read_pdf import read_pdf
-import os
-from helpers.shared import model
-from tools.generate_cover import generate_cover
-from tools.auto_apply import auto_apply
-from sentence_transformers import util
+from helpers.embeddings import cosine_scores
+from helpers.embedding_service import embed_texts
+from helpers.similarity_index import index_embeddings
+from helpers.near_duplicates import mark_duplicates, dedup_counters
+from helpers.keyword_index import index_descriptions
 from helpers.fetch_desc import fetch_desc
-from helpers.remoteok.fetch_desc import fetch_desc_remoteok
-from langchain_google_vertexai import ChatVertexAI
-from helpers.generate_cover_letter_for_job import generate_cover_letter_for_job
-from helpers.shared import resume_text_cache
+from helpers.fetch_desc_bulk import fetch_descs_bulk, FETCHERS
+from helpers.llm import get_cover_letter_llm
+from helpers.generate_cover_letter_for_job import generate_cover_letter_for_job, COVER_LETTER_CONCURRENCY
+from helpers.resume_cache import get_resume_artifacts
 from helpers.decrypt import decrypt_aes_key, decrypt_password
-from helpers.auto_apply_to_job import auto_apply_to_job
+from helpers.auto_apply_to_job import auto_apply_to_jobs
 from helpers.scrape_jobs_core import scrape_jobs_core
 from helpers.remoteok.scrape_jobs_core import scrape_jobs_core_remoteok
+from helpers.remoteok.feed import REMOTEOK_INGEST_MODE, feed_descriptions, feed_titles
+from helpers.keyword_matcher import get_keyword_matcher, normalized_job_text, fails_title_filter
 import json
+import asyncio
 from typing import Dict
 from datetime import datetime
 from helpers.send_workflow_completion_email import send_success_email, send_error_email
 
+LOGIN_FAILED_MESSAGE = "Could not log in to Y Combinator with the saved credentials. Update your Agent's credentials."
+
 
 def entry_node(state: State, config: RunnableConfig):
     return {
@@ -65,6 +67,8 @@ async def scrape_jobs_node(state: State, config: RunnableConfig) -> Dict:
         agent_type = config.get("configurable", {}).get("agent_type", "ycombinator")
         seen_urls = list(state.get("job_results", {}).keys())
         new_urls = []
+        feed_descs: dict[str, str] = {}
+        job_titles: dict[str, str] = {}
 
         if (agent_type == "ycombinator"):
             creds_res = supabase.table("encrypted_credentials_yc").select("*").eq("agent_id", thread_id).single().execute()
@@ -78,16 +82,24 @@ async def scrape_jobs_node(state: State, config: RunnableConfig) -> Dict:
             aes_key = padded_aes_key[:-pad_len]
             password = decrypt_password(creds["password_enc"], aes_key)
     
-            new_urls = await scrape_jobs_core(username, password, filter_url, seen_urls, no_jobs)
+            scraped = await scrape_jobs_core(username, password, filter_url, seen_urls, no_jobs, agent_id=thread_id)
+            new_urls = list(scraped)
+            job_titles = {url: title for url, title in scraped.items() if title}
         elif (agent_type == "remoteok"):
-            new_urls = await scrape_jobs_core_remoteok(filter_url, seen_urls, no_jobs)    
+            new_urls = await scrape_jobs_core_remoteok(filter_url, seen_urls, no_jobs)
+            if REMOTEOK_INGEST_MODE == "feed":
+                # The feed already carries descriptions; fetch_descriptions will skip these.
+                feed_descs = await feed_descriptions(new_urls)
+                job_titles = await feed_titles(new_urls)
 
 
         print("new urls: ", new_urls)
 
         updated_results = state.get("job_results", {})
         for url in new_urls:
-            updated_results[url] = {}
+            updated_results[url] = {"description": feed_descs[url]} if url in feed_descs else {}
+            if url in job_titles:
+                updated_results[url]["title"] = job_titles[url]
 
         return {"job_results": updated_results, "not_enough_urls": len(new_urls) < no_jobs}
 
@@ -102,21 +114,27 @@ async def fetch_descriptions(state: State, config: RunnableConfig):
     job_results = state.get("job_results", {})
     updated_results = dict(job_results)
     agent_type = config.get("configurable", {}).get("agent_type", "ycombinator")
-
-
-    for job_url, job_data in job_results.items():
-        if job_data.get("applied", False) or (job_data.get("description") and len(job_data.get("description", "")) > 30):
-            continue  # skip applied jobs
-
-        try:
-            if (agent_type == "ycombinator"):
-               description = await fetch_desc(job_url)
-               updated_results[job_url]["description"] = description
-            elif (agent_type == "remoteok"):
-                description = await fetch_desc_remoteok(job_url)
-                updated_results[job_url]["description"] = description   
-        except Exception as e:
-            updated_results[job_url]["description"] = ""
+    thread_id = config.get("configurable", {}).get("thread_id", "")
+    concurrency = config.get("configurable", {}).get("fetch_concurrency")
+
+    pending_urls = [
+        job_url for job_url, job_data in job_results.items()
+        if not job_data.get("applied", False)
+        and not (job_data.get("description") and len(job_data.get("description", "")) > 30)
+    ]
+
+    if pending_urls and agent_type in FETCHERS:
+        fetched = await fetch_descs_bulk(pending_urls, agent_type, concurrency)
+        for job_url, result in fetched.items():
+            updated_results[job_url]["description"] = "" if isinstance(result, Exception) else result
+
+    # Reposts and near-identical postings are marked so later nodes skip their work
+    await asyncio.to_thread(mark_duplicates, thread_id, updated_results)
+    await asyncio.to_thread(
+        index_descriptions,
+        thread_id,
+        {url: job.get("description", "") for url, job in updated_results.items()},
+    )
 
     print("inside fetch description node")
     return {"job_results": updated_results}
@@ -129,27 +147,45 @@ async def compare_jobs_bulk(state: State, config: RunnableConfig):
     thread_id = config.get("configurable", {}).get("thread_id", "")
 
     try:
-        response = supabase.storage.from_("resumes").download(resume_path)
-        temp_path = f"/tmp/resume-{thread_id}.pdf"
-        with open(temp_path, "wb") as f:
-            f.write(response)
-        resume_text = read_pdf(temp_path)
-        resume_embedding = model.encode(resume_text, convert_to_tensor=True)
-        os.remove(temp_path)
+        resume = await asyncio.to_thread(get_resume_artifacts, resume_path)
+        resume_embedding = await resume.embedding()
     except Exception:
         return {}
 
-    for job_url, job_data in job_results.items():
-        if not job_data.get("applied", False):
-           description = job_data.get("description", "")
-           if not description:
-               continue
-           try:
-               job_embedding = model.encode(description, convert_to_tensor=True)
-               similarity = util.cos_sim(resume_embedding, job_embedding).item()
-               job_data["score"] = similarity
-           except Exception:
-               job_data["score"] = 0.0
+    await asyncio.to_thread(mark_duplicates, thread_id, job_results)
+    # Jobs whose title already rules them out are not worth embedding
+    title_keywords = frozenset(json.loads(config.get("configurable", {}).get("job_title_contains", "[]")))
+    pending = [
+        (job_url, job_data.get("description", ""))
+        for job_url, job_data in job_results.items()
+        if not job_data.get("applied", False)
+        and job_data.get("description", "")
+        and not job_data.get("duplicate_of")
+        and not fails_title_filter(job_data, title_keywords)
+    ]
+    batch_size = config.get("configurable", {}).get("embed_batch_size")
+
+    if pending:
+        try:
+            # Cached vectors come from the store; the rest go through one batched forward
+            # pass on the embedding thread. Scoring is a single matrix-vector product.
+            job_embeddings = await embed_texts([desc for _, desc in pending], batch_size)
+            scores = cosine_scores(resume_embedding, job_embeddings).tolist()
+            await index_embeddings(
+                thread_id, [url for url, _ in pending], [desc for _, desc in pending], job_embeddings
+            )
+        except Exception:
+            scores = [0.0] * len(pending)
+
+        for (job_url, _), score in zip(pending, scores):
+            job_results[job_url]["score"] = score
+
+    # A near-identical copy scores like its original; reuse that instead of embedding it
+    for job_data in job_results.values():
+        canonical = job_results.get(job_data.get("duplicate_of") or "", {})
+        if "score" not in job_data and "score" in canonical and not job_data.get("applied", False):
+            job_data["score"] = canonical["score"]
+            dedup_counters["embeddings_skipped"] += 1
 
     print("inside compare jobs bulk")        
 
@@ -166,7 +202,13 @@ def filter_keywords(state: State, config: RunnableConfig):
     similarity_threshold = config.get("configurable", {}).get("similarity_threshold", 0.0)
     included = set(json.loads(config.get("configurable", {}).get("required_keywords", "[]")))
     excluded = set(json.loads(config.get("configurable", {}).get("excluded_keywords", "[]")))
-    title_included = set(json.loads(config.get("configurable", {}).get("job_title_contains", "[]")))
+    title_included = frozenset(json.loads(config.get("configurable", {}).get("job_title_contains", "[]")))
+
+    # One matcher for required and excluded keywords, so each description is scanned once
+    matcher = get_keyword_matcher(frozenset(included | excluded))
+    required = set(get_keyword_matcher(frozenset(included)).keywords)
+    forbidden = set(get_keyword_matcher(frozenset(excluded)).keywords)
+    new_duplicates = []
 
     for job_url, job in job_results.items():
         if job.get("applied", False):
@@ -178,12 +220,22 @@ def filter_keywords(state: State, config: RunnableConfig):
             job_urls_seen.add(job_url)
             continue
 
-        desc = job.get("description", "").lower()
+        if job.get("duplicate_of"):
+            # The original posting gets the cover letter and application
+            if job_url not in job_urls_seen:
+                new_duplicates.append(job)
+            job["suitable"] = False
+            job_urls_seen.add(job_url)
+            continue
+
+        found = matcher.find(normalized_job_text(job_url, job.get("description", "")))
 
-        # Keyword inclusion/exclusion logic
-        if included and not any(k.lower() in desc for k in included):
+        # Title, then keyword inclusion/exclusion logic
+        if fails_title_filter(job, title_included):
+            job["suitable"] = False
+        elif required and not found & required:
             job["suitable"] = False
-        elif any(k.lower() in desc for k in excluded):
+        elif found & forbidden:
             job["suitable"] = False
         else:
             job["suitable"] = True
@@ -197,6 +249,11 @@ def filter_keywords(state: State, config: RunnableConfig):
 
         job_urls_seen.add(job_url)
 
+    # A duplicate only saves a cover letter if its original is getting one
+    dedup_counters["cover_letters_skipped"] += sum(
+        1 for job in new_duplicates if job_results.get(job["duplicate_of"], {}).get("suitable")
+    )
+
     print("✅ inside filter_keywords")
 
     return {
@@ -210,7 +267,7 @@ def compare_jobs_condition(state: State, config: RunnableConfig):
     job_results = state.get("job_results", {})
     threshold = config.get("configurable", {}).get("similarity_threshold", 0.5)
     no_jobs = config.get("configurable", {}).get("max_jobs_to_apply", 5)
-    jobs_available = [job_url for job_url, job_data in job_results.items() if not job_data.get("applied", False) and job_data.get("score", 0.0) >= threshold ]
+    jobs_available = [job_url for job_url, job_data in job_results.items() if not job_data.get("applied", False) and not job_data.get("duplicate_of") and job_data.get("score", 0.0) >= threshold ]
     if len(jobs_available) >= no_jobs or state.get("not_enough_urls", False):
         return "filter_keywords"
     else: 
@@ -238,41 +295,44 @@ async def generate_covers_bulk(state: State, config: RunnableConfig):
     thread_id = config.get("configurable", {}).get("thread_id")
     resume_path = config.get("configurable", {}).get("resume_path", "")
     job_results = state.get("job_results", {})
-    llm = ChatVertexAI(model="gemini-2.0-flash-lite-001")
+    concurrency = config.get("configurable", {}).get("cover_concurrency") or COVER_LETTER_CONCURRENCY
+    force_regenerate = config.get("configurable", {}).get("regenerate_cover_letters", False)
+    llm = get_cover_letter_llm()
 
     if not thread_id or not resume_path:
         return {}
 
-    # Resume cache or download
-    if thread_id not in resume_text_cache:
-        response = supabase.storage.from_("resumes").download(resume_path)
-        temp_path = f"/tmp/resume-{thread_id}.pdf"
-        with open(temp_path, "wb") as f:
-            f.write(response)
-        resume_text = read_pdf(temp_path)
-        resume_text_cache[thread_id] = resume_text
-        os.remove(temp_path)
-    else:
-        resume_text = resume_text_cache[thread_id]
+    resume = await asyncio.to_thread(get_resume_artifacts, resume_path)
+    resume_summary = await asyncio.to_thread(resume.summary, 10)
 
-    for job_url, job_data in job_results.items():
-        if not job_data.get("suitable", False) or (job_data.get("cover_letter") and len(str(job_data.get("cover_letter", ""))) > 20):
-            continue  # Skip if already generated
+    pending = [
+        job_url for job_url, job_data in job_results.items()
+        if job_data.get("suitable", False)
+        and not job_data.get("duplicate_of")
+        and not (job_data.get("cover_letter") and len(str(job_data.get("cover_letter", ""))) > 20)
+    ]
+    semaphore = asyncio.Semaphore(max(1, concurrency))
 
-        try:
-            job_description = job_data.get("description")
+    async def generate(job_url: str) -> tuple[str, str, str]:
+        async with semaphore:
+            job_description = job_results[job_url].get("description")
             if not job_description:
                 job_description = await fetch_desc(job_url)
-
             cover_letter = await generate_cover_letter_for_job(
-                job_url, resume_text, job_description, llm=llm
+                job_url, resume.text, job_description, llm=llm, summarized_resume=resume_summary,
+                force_regenerate=force_regenerate
             )
+            return job_url, job_description, cover_letter
 
-            job_data["cover_letter"] = cover_letter
-            job_data["description"] = job_description
+    # Requests run concurrently under the Vertex token bucket; each result is stored as it lands
+    for next_done in asyncio.as_completed([generate(job_url) for job_url in pending]):
+        try:
+            job_url, job_description, cover_letter = await next_done
         except Exception as e:
             continue
             # job_data["cover_letter"] = f"Error: {str(e)}"
+        job_results[job_url]["cover_letter"] = cover_letter
+        job_results[job_url]["description"] = job_description
 
     return {"job_results": job_results}
 
@@ -301,18 +361,33 @@ async def auto_apply_bulk(state: State, config: RunnableConfig):
     if not username:
         return {}
 
-    for job_url, job_data in job_results.items():
-        if not job_data.get("suitable") or job_data.get("applied", False) or not job_data.get("cover_letter"):
-            continue
+    candidates = [
+        (job_url, str(job_data.get("cover_letter", "")))
+        for job_url, job_data in job_results.items()
+        if job_data.get("suitable") and not job_data.get("applied", False) and job_data.get("cover_letter")
+    ]
+    max_tabs = config.get("configurable", {}).get("apply_tabs")
 
+    # Apply in batches sharing one login; top up from the remaining candidates when some fail.
+    while applied_jobs < no_jobs and candidates:
+        batch, candidates = candidates[:no_jobs - applied_jobs], candidates[no_jobs - applied_jobs:]
         try:
-            await auto_apply_to_job(job_url, username, password, str(job_data.get("cover_letter", "")))
-            job_data["applied"] = True
-            applied_jobs += 1
-            if (applied_jobs == no_jobs):
-                break
+            outcomes, login_error = await auto_apply_to_jobs(batch, username, password, agent_id=thread_id, max_tabs=max_tabs)
         except Exception as e:
-            continue
+            print(f"[auto_apply_bulk] ERROR: {e}")
+            break
+
+        if login_error:
+            # Retrying with the same credentials would only risk locking the account
+            print(f"[auto_apply_bulk] {login_error}")
+            return {"job_results": job_results, "login_error": login_error}
+
+        for job_url, error in outcomes.items():
+            if error is None:
+                job_results[job_url]["applied"] = True
+                applied_jobs += 1
+            else:
+                print(f"[auto_apply_bulk] Failed to apply to {job_url}: {error}")
 
     return {"job_results": job_results}
 
@@ -325,6 +400,7 @@ async def store_workflow_run_result(state: State, config: RunnableConfig) -> dic
         no_jobs = config_data.get("max_jobs_to_apply", 5)
         auto_apply = config_data.get("auto_apply", False)
         not_enough_urls = state.get("not_enough_urls", False)
+        login_error = state.get("login_error")
 
         if not workflow_id:
             raise ValueError("Missing workflow_id in config")
@@ -356,7 +432,7 @@ async def store_workflow_run_result(state: State, config: RunnableConfig) -> dic
             "started_at": state.get("started_at") or datetime.utcnow().isoformat(),
             "ended_at": datetime.utcnow().isoformat(),
             "status": "success" if success else "incomplete",
-            "error": None if success else ("Job Postings exhausted for the current Job Posting URL. Update your Agent's Job Posting URL." if not_enough_urls else f"{'applied' if auto_apply else 'suitable'} jobs found: {applied_count if auto_apply else suitable_count}, expected: {no_jobs}"),
+            "error": None if success else (LOGIN_FAILED_MESSAGE if login_error else "Job Postings exhausted for the current Job Posting URL. Update your Agent's Job Posting URL." if not_enough_urls else f"{'applied' if auto_apply else 'suitable'} jobs found: {applied_count if auto_apply else suitable_count}, expected: {no_jobs}"),
             "job_results": job_results,
             "suitable_jobs_scraped_or_applied_in_current_run": suitable_urls,
         }
@@ -371,7 +447,7 @@ async def store_workflow_run_result(state: State, config: RunnableConfig) -> dic
             agent_name= config_data.get("agent_name", ""),
             summary= f"Workflow completed successfully. {suitable_count} suitable jobs found, {applied_count} applied." if success else (
                 f"Workflow completed with issues. {suitable_count} suitable jobs found, {applied_count} applied. "
-                f"{'Not enough URLs to scrape.' if not_enough_urls else 'Job Postings exhausted for the current Job Posting URL. Update your Agents Job Posting URL.'}"
+                f"{LOGIN_FAILED_MESSAGE if login_error else 'Not enough URLs to scrape.' if not_enough_urls else 'Job Postings exhausted for the current Job Posting URL. Update your Agents Job Posting URL.'}"
             )
         )
 
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import os
+import re
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+from playwright.async_api import BrowserContext, Page
+from helpers.browser_pool import browser_pool
+from helpers.decrypt import encrypt_with_kek, decrypt_with_kek
+
+
+YC_LOGIN_URL = "https://account.ycombinator.com/?continue=https%3A%2F%2Fwww.workatastartup.com%2F"
+YC_SESSION_DIR = os.environ.get("YC_SESSION_DIR", "/tmp/yc-sessions")
+
+# Decrypted Playwright storage_state per agent, backed by KEK-encrypted files on disk.
+_sessions: dict[str, dict[str, Any]] = {}
+_login_locks: dict[str, asyncio.Lock] = {}
+
+
+def _session_path(agent_id: str) -> str:
+    return os.path.join(YC_SESSION_DIR, f"{agent_id}.bin")
+
+
+def _session_is_fresh(state: dict[str, Any]) -> bool:
+    cookies = [
+        c for c in state.get("cookies", [])
+        if "ycombinator.com" in c.get("domain", "") or "workatastartup.com" in c.get("domain", "")
+    ]
+    if not cookies:
+        return False
+    now = time.time()
+    # Session cookies have expires == -1 and live as long as we keep the state around.
+    return all(c.get("expires", -1) == -1 or c["expires"] > now for c in cookies)
+
+
+def load_session(agent_id: str) -> Optional[dict[str, Any]]:
+    if not agent_id:
+        return None
+
+    state = _sessions.get(agent_id)
+    if state is None:
+        try:
+            with open(_session_path(agent_id), "rb") as f:
+                state = json.loads(decrypt_with_kek(f.read()))
+        except Exception:
+            return None
+
+    if not _session_is_fresh(state):
+        clear_session(agent_id)
+        return None
+
+    _sessions[agent_id] = state
+    return state
+
+
+def save_session(agent_id: str, state: dict[str, Any]):
+    if not agent_id:
+        return
+    _sessions[agent_id] = state
+    try:
+        os.makedirs(YC_SESSION_DIR, exist_ok=True)
+        path = _session_path(agent_id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(encrypt_with_kek(json.dumps(state).encode("utf-8")))
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"[yc_session] Could not persist session for {agent_id}: {e}")
+
+
+def clear_session(agent_id: str):
+    _sessions.pop(agent_id, None)
+    try:
+        os.remove(_session_path(agent_id))
+    except FileNotFoundError:
+        pass
+
+
+async def needs_login(page: Page) -> bool:
+    if "account.ycombinator.com" in page.url:
+        return True
+    return await page.locator("a:text-matches('^\\s*log ?in\\s*$', 'i')").count() > 0
+
+
+async def login(page: Page, username: str, password: str):
+    await page.goto(YC_LOGIN_URL, wait_until="domcontentloaded")
+    await page.fill('input[name="username"]', username)
+    await page.fill('input[name="password"]', password)
+    await page.click('button[type="submit"]')
+    # Wait for the redirect back to WorkAtAStartup instead of a fixed sleep.
+    await page.wait_for_url(re.compile(r"^https://(www\.)?workatastartup\.com/"), timeout=15000)
+
+
+@asynccontextmanager
+async def yc_context(agent_id: str, profile: str = "ycombinator", **context_kwargs) -> AsyncIterator[BrowserContext]:
+    """Pooled browser context preloaded with the agent's stored YC session, if any."""
+    state = load_session(agent_id)
+    if state is not None:
+        context_kwargs["storage_state"] = state
+    async with browser_pool.context(profile, **context_kwargs) as context:
+        yield context
+
+
+async def goto_authenticated(
+    page: Page,
+    url: str,
+    agent_id: str,
+    username: str,
+    password: str,
+    **goto_kwargs
+):
+    """
+    Navigate to `url` as a logged-in YC user. Logs in only when there is no
+    stored session for the agent or the stored one turns out to be expired.
+    """
+    if load_session(agent_id) is not None:
+        await page.goto(url, **goto_kwargs)
+        if not await needs_login(page):
+            return
+        clear_session(agent_id)
+
+    lock = _login_locks.setdefault(agent_id or "", asyncio.Lock())
+    async with lock:
+        state = load_session(agent_id)
+        if state is not None:
+            # Another coroutine logged in while we were waiting on the lock.
+            await page.context.add_cookies(state.get("cookies", []))
+        else:
+            await login(page, username, password)
+            save_session(agent_id, await page.context.storage_state())
+
+    await page.goto(url, **goto_kwargs)
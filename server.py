@@ -19,10 +19,39 @@ from slowapi import Limiter
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from helpers.check_auth import get_current_user
+from helpers.browser_pool import browser_pool
+from helpers.browser_workers import browser_workers
+from helpers.http_fetch import close_http_client, fetch_counters
+from helpers.resource_blocking import blocking_totals
+from helpers.embedding_service import embedding_service
+from helpers.near_duplicates import dedup_counters
+from helpers.cover_letter_cache import cover_letter_cache_counters
+from helpers.warmup import WARMUP_MODE, warmup, warmup_stats
+from contextlib import asynccontextmanager
 
 limiter = Limiter(key_func=get_remote_address)
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # With out-of-process workers the browsers live in the workers, not in this process.
+    if browser_workers.size > 0:
+        await browser_workers.start()
+    else:
+        await browser_pool.start()
+    # Models, tokenizer data and tool modules load lazily; warm them before (or while) serving.
+    warmup_task = None
+    if WARMUP_MODE == "blocking":
+        await asyncio.to_thread(warmup)
+    elif WARMUP_MODE == "background":
+        warmup_task = asyncio.create_task(asyncio.to_thread(warmup))
+    yield
+    if warmup_task is not None:
+        await warmup_task
+    await close_http_client()
+    await browser_workers.stop()
+    await browser_pool.stop()
+
+app = FastAPI(lifespan=lifespan)
 app.state.limiter = limiter
 from fastapi.responses import Response
 
@@ -157,6 +186,54 @@ async def run_workflow(agent_id: str, request: Request, user= Depends(get_curren
     return JSONResponse(content={"status": "success", "message": "Workflow completed."})
 
 
+@app.get("/metrics/browser-pool")
+@limiter.limit("30/minute")
+def browser_pool_metrics(request: Request, user= Depends(get_current_user)):
+    return JSONResponse(content=browser_pool.stats())
+
+
+@app.get("/metrics/browser-workers")
+@limiter.limit("30/minute")
+def browser_workers_metrics(request: Request, user= Depends(get_current_user)):
+    return JSONResponse(content=browser_workers.stats())
+
+
+@app.get("/metrics/fetch-desc")
+@limiter.limit("30/minute")
+def fetch_desc_metrics(request: Request, user= Depends(get_current_user)):
+    return JSONResponse(content=fetch_counters)
+
+
+@app.get("/metrics/resource-blocking")
+@limiter.limit("30/minute")
+def resource_blocking_metrics(request: Request, user= Depends(get_current_user)):
+    return JSONResponse(content=blocking_totals)
+
+
+@app.get("/metrics/embeddings")
+@limiter.limit("30/minute")
+def embedding_metrics(request: Request, user= Depends(get_current_user)):
+    return JSONResponse(content=embedding_service.stats())
+
+
+@app.get("/metrics/dedup")
+@limiter.limit("30/minute")
+def dedup_metrics(request: Request, user= Depends(get_current_user)):
+    return JSONResponse(content=dedup_counters)
+
+
+@app.get("/metrics/cover-letter-cache")
+@limiter.limit("30/minute")
+def cover_letter_cache_metrics(request: Request, user= Depends(get_current_user)):
+    return JSONResponse(content=cover_letter_cache_counters)
+
+
+@app.get("/metrics/warmup")
+@limiter.limit("30/minute")
+def warmup_metrics(request: Request, user= Depends(get_current_user)):
+    return JSONResponse(content=warmup_stats)
+
+
 @app.get("/test")
 @limiter.limit("2/minute")
 def testFunc(request: Request, user= Depends(get_current_user)):
@@ -0,0 +1,80 @@
+import asyncio
+import pickle
+from contextlib import asynccontextmanager
+import pytest
+
+pytest.importorskip("playwright")
+pytest.importorskip("cryptography")
+from helpers import auto_apply_to_job as apply
+
+
+class FakePage:
+    def __init__(self, login_page: bool = False):
+        self.login_page = login_page
+        self.visited: list[str] = []
+
+    async def goto(self, url, **kwargs):
+        self.visited.append(url)
+
+    async def close(self):
+        pass
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages: list[FakePage] = []
+
+    async def new_page(self):
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+
+@pytest.fixture
+def context(monkeypatch):
+    context = FakeContext()
+
+    @asynccontextmanager
+    async def yc_context(agent_id, profile="ycombinator"):
+        yield context
+
+    async def needs_login(page):
+        return page.login_page
+
+    async def submit(page, cover_letter):
+        pass
+
+    monkeypatch.setattr(apply, "yc_context", yc_context)
+    monkeypatch.setattr(apply, "needs_login", needs_login)
+    monkeypatch.setattr(apply, "_submit_application", submit)
+    return context
+
+
+JOBS = [("https://www.workatastartup.com/jobs/1", "c1"), ("https://www.workatastartup.com/jobs/2", "c2")]
+
+
+def test_login_failure_is_reported_separately_and_stops_the_batch(context, monkeypatch):
+    logins = []
+
+    async def goto_authenticated(page, url, agent_id, username, password, **kwargs):
+        logins.append(url)
+        raise TimeoutError("Timeout 15000ms exceeded waiting for workatastartup.com")
+
+    monkeypatch.setattr(apply, "goto_authenticated", goto_authenticated)
+    result = asyncio.run(apply.auto_apply_to_jobs(JOBS, "user", "wrong", agent_id="agent"))
+
+    outcomes, login_error = pickle.loads(pickle.dumps(result))  # as returned by a browser worker
+    assert outcomes == {}
+    assert login_error.startswith("Login failed:")
+    assert logins == [JOBS[0][0]]
+
+
+def test_successful_batch_has_no_login_error(context, monkeypatch):
+    async def goto_authenticated(page, url, agent_id, username, password, **kwargs):
+        await page.goto(url)
+
+    monkeypatch.setattr(apply, "goto_authenticated", goto_authenticated)
+    outcomes, login_error = asyncio.run(apply.auto_apply_to_jobs(JOBS, "user", "pw", agent_id="agent"))
+
+    assert outcomes == {JOBS[0][0]: None, JOBS[1][0]: None}
+    assert login_error is None
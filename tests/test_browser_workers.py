@@ -0,0 +1,112 @@
+import asyncio
+import queue
+import pytest
+from helpers.browser_workers import BrowserWorkerPool
+
+
+class FakeProcess:
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.exitcode = None
+
+    def is_alive(self) -> bool:
+        return self.exitcode is None
+
+
+class FakeQueue(queue.Queue):
+    def close(self):
+        pass
+
+
+def make_pool(size: int = 2) -> BrowserWorkerPool:
+    pool = BrowserWorkerPool(size=size, concurrency=2, max_jobs=10, max_rss_mb=1000, job_timeout_s=5)
+    pids = iter(range(100, 200))
+
+    def spawn(worker_id: int):
+        pool._workers[worker_id] = FakeProcess(next(pids))
+        pool._job_queues[worker_id] = FakeQueue()
+        pool._inflight[worker_id] = set()
+        pool._retired.discard(worker_id)
+        pool._exited_cleanly.discard(worker_id)
+
+    pool._spawn = spawn
+    for worker_id in range(size):
+        spawn(worker_id)
+    pool.running = True
+    return pool
+
+
+def queued(pool: BrowserWorkerPool, worker_id: int) -> list[str]:
+    return [job[0] for job in pool._job_queues[worker_id].queue]
+
+
+def test_jobs_are_spread_over_workers_and_owned_from_dispatch():
+    async def scenario():
+        pool = make_pool()
+        tasks = [asyncio.create_task(pool.submit("fetch_desc", (f"url{i}",))) for i in range(4)]
+        await asyncio.sleep(0)
+
+        assert [len(pool._inflight[w]) for w in (0, 1)] == [2, 2]
+        assert set(queued(pool, 0)) == pool._inflight[0]
+
+        for worker_id in (0, 1):
+            for job_id in queued(pool, worker_id):
+                pool._on_message(("done", job_id, worker_id, True, job_id))
+        assert len(set(await asyncio.gather(*tasks))) == 4
+        assert pool._inflight == {0: set(), 1: set()} and not pool._jobs
+
+    asyncio.run(scenario())
+
+
+def test_crashed_worker_fails_its_jobs_on_reap_even_before_started():
+    async def scenario():
+        pool = make_pool(size=1)
+        task = asyncio.create_task(pool.submit("auto_apply_batch"))
+        await asyncio.sleep(0)
+
+        # The worker took the job off its queue and died before reporting "started".
+        pool._workers[0].exitcode = -9
+        pool._reap()
+
+        with pytest.raises(Exception, match="exited"):
+            await asyncio.wait_for(task, 1)
+        assert pool._metrics["crashes"] == 1 and pool._workers[0].is_alive()
+
+    asyncio.run(scenario())
+
+
+def test_retired_worker_hands_back_jobs_it_never_started():
+    async def scenario():
+        pool = make_pool()
+        first = asyncio.create_task(pool.submit("scrape_jobs"))
+        second = asyncio.create_task(pool.submit("scrape_jobs"))
+        await asyncio.sleep(0)
+        (started,) = queued(pool, 0)
+        (unstarted,) = queued(pool, 1)
+
+        # Worker 1 retires without taking its job; worker 0 is mid-job.
+        pool._on_message(("started", started, 0, None, None))
+        pool._on_message(("exited", None, 1, None, pool._workers[1].pid))
+        assert queued(pool, 0) == [started, unstarted]
+        assert pool._inflight[0] == {started, unstarted} and pool._inflight[1] == set()
+
+        # A clean exit is reaped on the tick after its "exited" message, with nothing failed.
+        pool._workers[1].exitcode = 0
+        pool._reap()
+        assert pool._metrics["restarts"] == 1 and pool._metrics["failed"] == 0
+
+        pool._on_message(("done", started, 0, True, "a"))
+        pool._on_message(("done", unstarted, 0, True, "b"))
+        assert await asyncio.gather(first, second) == ["a", "b"]
+
+    asyncio.run(scenario())
+
+
+def test_exited_message_from_a_previous_process_is_ignored():
+    pool = make_pool(size=1)
+    stale_pid = pool._workers[0].pid
+    pool._workers[0].exitcode = 1
+    pool._reap()
+
+    pool._on_message(("exited", None, 0, None, stale_pid))
+    assert 0 not in pool._retired
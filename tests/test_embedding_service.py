@@ -0,0 +1,110 @@
+import asyncio
+import threading
+import numpy as np
+import pytest
+from helpers import embedding_service as service_module
+from helpers.embedding_service import EmbeddingService
+
+
+class SlowStore:
+    """Stands in for the embedding store: one row per text, after a gate opens."""
+
+    dim = 4
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.started = threading.Event()
+        self.calls = 0
+
+    def get_or_encode(self, texts, batch_size=None):
+        self.calls += 1
+        self.started.set()
+        self.gate.wait(timeout=5)
+        return np.array([[len(t), 0, 0, 0] for t in texts], dtype=np.float32)
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = SlowStore()
+    monkeypatch.setattr(service_module, "get_embedding_store", lambda: store)
+    return store
+
+
+def test_cancelled_waiter_does_not_kill_encoder_thread(store):
+    service = EmbeddingService(max_wait_ms=50, max_batch_texts=256)
+
+    async def scenario():
+        kept = asyncio.create_task(service.embed(["aaa"]))
+        dropped = asyncio.create_task(service.embed(["bb"]))
+        await asyncio.to_thread(store.started.wait, 5)
+
+        # The caller goes away (SSE disconnect, wait_for timeout) while its batch encodes.
+        dropped.cancel()
+        await asyncio.sleep(0)
+        store.gate.set()
+
+        assert (await asyncio.wait_for(kept, 5))[0, 0] == 3
+        with pytest.raises(asyncio.CancelledError):
+            await dropped
+
+        # The thread survived and still serves new requests.
+        later = await asyncio.wait_for(service.embed(["cccc"]), 5)
+        assert later[0, 0] == 4
+
+    asyncio.run(scenario())
+    assert service._thread is not None and service._thread.is_alive()
+
+
+def test_requests_cancelled_before_dequeue_are_skipped(store):
+    service = EmbeddingService(max_wait_ms=1, max_batch_texts=256)
+    store.gate.set()
+
+    abandoned = service.submit(["x"])
+    abandoned.cancel()
+    assert service.embed_sync(["yy"])[0, 0] == 2
+    assert abandoned.cancelled()
+
+
+def test_dead_encoder_thread_is_restarted(store):
+    service = EmbeddingService(max_wait_ms=1, max_batch_texts=256)
+    store.gate.set()
+    service._thread = threading.Thread(target=lambda: None)
+    service._thread.start()
+    service._thread.join()
+
+    assert service.embed_sync(["zzz"])[0, 0] == 3
+    assert service._thread.is_alive()
+
+
+def test_store_errors_fail_only_that_batch(store, monkeypatch):
+    service = EmbeddingService(max_wait_ms=1, max_batch_texts=256)
+    store.gate.set()
+    original = store.get_or_encode
+
+    def broken_once(texts, batch_size=None):
+        monkeypatch.setattr(store, "get_or_encode", original)
+        raise RuntimeError("model blew up")
+
+    monkeypatch.setattr(store, "get_or_encode", broken_once)
+    with pytest.raises(RuntimeError):
+        service.embed_sync(["a"])
+    assert service.embed_sync(["abcd"])[0, 0] == 4
+
+
+def test_unpersisted_requests_bypass_the_store(store, monkeypatch):
+    service = EmbeddingService(max_wait_ms=50, max_batch_texts=256)
+    store.gate.set()
+    encoded = []
+
+    def encode_texts(texts, batch_size=None):
+        encoded.append(list(texts))
+        return np.array([[0, len(t), 0, 0] for t in texts], dtype=np.float32)
+
+    monkeypatch.setattr(service_module, "encode_texts", encode_texts)
+    persisted = service.submit(["stored"])
+    sentences = service.submit(["one  sentence", "two"], persist=False)
+
+    assert persisted.result(5)[0, 0] == 6
+    assert sentences.result(5)[:, 1].tolist() == [12, 3]
+    assert encoded == [["one sentence", "two"]]
+    assert store.calls == 1
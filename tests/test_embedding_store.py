@@ -0,0 +1,77 @@
+import threading
+import numpy as np
+import pytest
+from helpers import embedding_store
+from helpers.embedding_store import EmbeddingStore, content_key
+
+
+def fake_vector(text: str) -> np.ndarray:
+    return np.array([len(text), sum(map(ord, text)) % 97, 1, 0], dtype=np.float32)
+
+
+@pytest.fixture
+def encoded(monkeypatch):
+    calls: list[list[str]] = []
+
+    def encode_texts(texts, batch_size=None):
+        calls.append(list(texts))
+        return np.stack([fake_vector(t) for t in texts])
+
+    monkeypatch.setattr(embedding_store, "encode_texts", encode_texts)
+    return calls
+
+
+def test_only_unseen_texts_are_encoded_and_shared_across_instances(tmp_path, encoded):
+    store = EmbeddingStore(str(tmp_path), "model", 4)
+    first = store.get_or_encode(["a", "bb  cc", "a"])
+    again = EmbeddingStore(str(tmp_path), "model", 4).get_or_encode(["bb cc", "ddd"])
+
+    assert encoded == [["a", "bb cc"], ["ddd"]]
+    assert np.array_equal(first[1], again[0])
+    assert np.array_equal(store.get("ddd"), fake_vector("ddd"))
+
+
+def test_model_runs_without_the_store_lock(tmp_path, monkeypatch):
+    store = EmbeddingStore(str(tmp_path), "model", 4)
+    encoding = threading.Event()
+    release = threading.Event()
+
+    def slow_encode(texts, batch_size=None):
+        encoding.set()
+        release.wait(5)
+        return np.stack([fake_vector(t) for t in texts])
+
+    monkeypatch.setattr(embedding_store, "encode_texts", lambda texts, batch_size=None: np.stack([fake_vector(t) for t in texts]))
+    store.get_or_encode(["cached"])
+    monkeypatch.setattr(embedding_store, "encode_texts", slow_encode)
+
+    writer = threading.Thread(target=store.get_or_encode, args=(["slow"],))
+    writer.start()
+    assert encoding.wait(5)
+    # Reads of stored texts are not blocked behind the running encode.
+    assert np.array_equal(store.get_or_encode(["cached"])[0], fake_vector("cached"))
+    release.set()
+    writer.join(5)
+    assert np.array_equal(store.get("slow"), fake_vector("slow"))
+
+
+def test_full_store_compacts_to_newest_rows(tmp_path, encoded):
+    store = EmbeddingStore(str(tmp_path), "model", 4, max_rows=8)
+    for i in range(8):
+        store.get_or_encode([f"text {i}"])
+    other = EmbeddingStore(str(tmp_path), "model", 4, max_rows=8)
+    assert other.get("text 0") is not None
+
+    result = store.get_or_encode(["text 0", "new"])
+
+    # Half of max_rows survives: the texts of this call plus the newest others.
+    assert store._rows_on_disk() == 4
+    assert set(store._index) == {content_key("text 0", "model"), content_key("new", "model"),
+                                 content_key("text 7", "model"), content_key("text 6", "model")}
+    assert np.array_equal(result, np.stack([fake_vector("text 0"), fake_vector("new")]))
+    # Another process switches to the new generation on its next miss; keys are content
+    # hashes, so rows it still reads from the old (unlinked) file are correct meanwhile.
+    assert np.array_equal(other.get("text 1"), fake_vector("text 1"))
+    assert np.array_equal(other.get("new"), fake_vector("new"))
+    assert other.get("text 1") is None
+    assert sorted(p.name for p in (tmp_path / "model").iterdir()) == [".lock", "generation", "index.1.tsv", "vectors.1.f32"]
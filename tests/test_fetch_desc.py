@@ -0,0 +1,128 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+import pytest
+
+pytest.importorskip("bs4")
+pytest.importorskip("playwright")
+from helpers import fetch_desc as yc
+from helpers import http_fetch
+from helpers.remoteok import fetch_desc as remoteok
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture(autouse=True)
+def fresh_counters(monkeypatch):
+    monkeypatch.setattr(http_fetch, "fetch_counters", {})
+
+
+def test_parse_desc_html_builds_markdown_description():
+    assert yc.parse_desc_html(fixture("yc_job.html")) == (
+        "# Acme Robotics (W21)\n\n"
+        "## About the role\n"
+        "We are hiring a backend engineer to own our fleet API.\nPython and PostgreSQL\n3+ years of experience\n\n"
+        "## About Acme Robotics\n"
+        "Acme builds autonomous picking robots for mid-size warehouses."
+    )
+
+
+def test_parse_desc_html_returns_none_for_client_rendered_page():
+    assert yc.parse_desc_html(fixture("yc_job_unrendered.html")) is None
+
+
+@pytest.mark.parametrize("html", [None, fixture("yc_job_unrendered.html")])
+def test_fetch_desc_falls_back_to_playwright(monkeypatch, html):
+    browser_urls = []
+
+    async def fetch_html(url):
+        return html
+
+    async def fetch_desc_browser(url):
+        browser_urls.append(url)
+        return "# From the browser"
+
+    monkeypatch.setattr(yc, "fetch_html", fetch_html)
+    monkeypatch.setattr(yc, "fetch_desc_browser", fetch_desc_browser)
+
+    url = "https://www.workatastartup.com/jobs/12345"
+    assert asyncio.run(yc.fetch_desc(url, mode="http")) == "# From the browser"
+    assert browser_urls == [url]
+    assert http_fetch.fetch_counters["ycombinator"] == {"http": 0, "fallback": 1}
+
+
+def test_fetch_desc_uses_http_page_when_complete(monkeypatch):
+    async def fetch_html(url):
+        return fixture("yc_job.html")
+
+    async def fetch_desc_browser(url):
+        pytest.fail("the browser must not be used when the HTTP page is complete")
+
+    monkeypatch.setattr(yc, "fetch_html", fetch_html)
+    monkeypatch.setattr(yc, "fetch_desc_browser", fetch_desc_browser)
+
+    description = asyncio.run(yc.fetch_desc("https://www.workatastartup.com/jobs/12345", mode="http"))
+    assert description.startswith("# Acme Robotics")
+    assert http_fetch.fetch_counters["ycombinator"] == {"http": 1, "fallback": 0}
+
+
+class RenderedPage:
+    """Stands in for a Playwright page that has rendered `html`."""
+
+    def __init__(self, html: str):
+        self.html = html
+
+    async def goto(self, url, **kwargs):
+        pass
+
+    async def wait_for_timeout(self, ms):
+        pass
+
+    async def content(self):
+        return self.html
+
+
+def test_http_and_browser_paths_produce_identical_descriptions(monkeypatch):
+    html = fixture("yc_job.html")
+
+    @asynccontextmanager
+    async def page(profile):
+        yield RenderedPage(html)
+
+    monkeypatch.setattr(yc.browser_pool, "page", page)
+    from_browser = asyncio.run(yc.fetch_desc_browser("https://www.workatastartup.com/jobs/12345"))
+
+    assert from_browser == yc.parse_desc_html(html)
+    assert from_browser.splitlines()[0] == "# Acme Robotics (W21)"
+
+
+def test_parse_desc_html_remoteok_reads_first_html_block():
+    assert remoteok.parse_desc_html_remoteok(fixture("remoteok_job.html")) == (
+        "Globex is looking for a\nSenior Python Engineer\nto join our data platform team.\n"
+        "You will build ingestion pipelines and APIs.\n"
+        "Django or FastAPI\nAWS"
+    )
+
+
+def test_parse_desc_html_remoteok_returns_none_without_description():
+    assert remoteok.parse_desc_html_remoteok(fixture("remoteok_job_blocked.html")) is None
+
+
+def test_fetch_desc_remoteok_falls_back_to_playwright(monkeypatch):
+    async def fetch_html(url):
+        return fixture("remoteok_job_blocked.html")
+
+    async def fetch_desc_remoteok_browser(url):
+        return "From the browser"
+
+    monkeypatch.setattr(remoteok, "fetch_html", fetch_html)
+    monkeypatch.setattr(remoteok, "fetch_desc_remoteok_browser", fetch_desc_remoteok_browser)
+
+    url = "https://remoteok.com/remote-jobs/remote-senior-python-engineer-globex-1093184"
+    assert asyncio.run(remoteok.fetch_desc_remoteok(url, mode="http")) == "From the browser"
+    assert http_fetch.fetch_counters["remoteok"] == {"http": 0, "fallback": 1}
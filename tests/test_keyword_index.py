@@ -0,0 +1,48 @@
+import pytest
+from helpers.keyword_index import KeywordIndex, parse_query
+
+JOBS = {
+    "https://jobs/cpp": {"description": "Senior C++ engineer. Modern C++17, CMake."},
+    "https://jobs/c": {"description": "Embedded C developer for firmware."},
+    "https://jobs/dotnet": {"description": "Backend role on .NET and C#, some ASP.NET."},
+    "https://jobs/node": {"description": "Full stack: Node.js and React. 5+ years required."},
+    "https://jobs/python": {"description": "We use Python. Django is a plus."},
+}
+
+
+@pytest.fixture
+def index():
+    index = KeywordIndex()
+    index.sync(JOBS)
+    return index
+
+
+def urls(index, query):
+    return sorted(hit["url"].rsplit("/", 1)[1] for hit in index.search(query))
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("c++", ["cpp"]),
+    ("C", ["c"]),
+    ("c#", ["dotnet"]),
+    (".net", ["dotnet"]),
+    ("net", ["dotnet"]),
+    ("node.js", ["node"]),
+    ("node", ["node"]),
+    ("python", ["python"]),
+    ("5+ years", ["node"]),
+    ('"c++ engineer"', ["cpp"]),
+    ("c++ OR c#", ["cpp", "dotnet"]),
+])
+def test_tech_terms_keep_their_punctuation(index, query, expected):
+    assert urls(index, query) == expected
+
+
+def test_sentence_punctuation_is_not_part_of_a_term():
+    assert parse_query("Python. django, c++.") == [[["python"], ["django"], ["c++"]]]
+
+
+def test_updating_a_description_removes_its_old_terms(index):
+    index.upsert("https://jobs/node", "Go and Rust.")
+    assert urls(index, "node") == []
+    assert urls(index, "rust") == ["node"]
@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+from helpers.rate_limit import TokenBucket, call_with_rate_limit, is_rate_limit_error
+
+
+class ResourceExhausted(Exception):
+    code = 429
+
+
+class HTTPError(Exception):
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def wrapped(cause: Exception) -> Exception:
+    try:
+        raise RuntimeError("LLM call failed") from cause
+    except RuntimeError as e:
+        return e
+
+
+@pytest.mark.parametrize("error", [
+    ResourceExhausted("Quota exceeded for aiplatform.googleapis.com"),
+    HTTPError("Too Many Requests", 429),
+    wrapped(ResourceExhausted("quota")),
+])
+def test_rate_limit_errors_are_recognized(error):
+    assert is_rate_limit_error(error)
+
+
+@pytest.mark.parametrize("error", [
+    ValueError("Cover letter for job 429 failed"),
+    RuntimeError("upstream said RESOURCE_EXHAUSTED in a log line"),
+    HTTPError("Internal error (429 retries left)", 500),
+    wrapped(ValueError("429")),
+])
+def test_messages_mentioning_429_are_not_rate_limit_errors(error):
+    assert not is_rate_limit_error(error)
+
+
+def test_only_rate_limit_errors_are_retried():
+    limiter = TokenBucket(rate=1000, capacity=10)
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ResourceExhausted("quota")
+        return "ok"
+
+    async def broken():
+        raise ValueError("job 429 has no description")
+
+    assert asyncio.run(call_with_rate_limit(flaky, limiter, base_delay_s=0.001)) == "ok"
+    assert len(attempts) == 3
+    with pytest.raises(ValueError):
+        asyncio.run(call_with_rate_limit(broken, limiter, base_delay_s=0.001))
@@ -0,0 +1,113 @@
+import asyncio
+import json
+import os
+import pytest
+
+pytest.importorskip("bs4")
+pytest.importorskip("playwright")
+from helpers.remoteok import feed
+from helpers.remoteok import scrape_jobs_core
+from helpers.remoteok.feed import parse_feed, tags_from_filter_url
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+GLOBEX = "https://remoteok.com/remote-jobs/remote-senior-python-engineer-globex-1093184"
+INITECH = "https://remoteok.com/remote-jobs/remote-react-developer-initech-1093177"
+HOOLI = "https://remoteok.com/remote-jobs/remote-python-data-engineer-hooli-1093150"
+
+
+@pytest.fixture
+def payload():
+    with open(os.path.join(FIXTURES, "remoteok_feed.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def recorded_feed(monkeypatch, payload):
+    jobs = parse_feed(payload)
+
+    async def get_feed(force=False):
+        return jobs
+
+    monkeypatch.setattr(feed, "get_feed", get_feed)
+    return jobs
+
+
+def test_parse_feed_skips_legal_notice_and_items_without_slug(payload):
+    assert "legal" in payload[0]
+    assert list(parse_feed(payload)) == [GLOBEX, INITECH, HOOLI]
+
+
+def test_parse_feed_normalizes_tags_and_strips_description_html(payload):
+    job = parse_feed(payload)[GLOBEX]
+    assert job["position"] == "Senior Python Engineer"
+    assert job["company"] == "Globex"
+    assert job["tags"] == ["python", "machine learning", "back end"]
+    assert job["description"] == "Globex is looking for a\nSenior Python Engineer\n.\nDjango or FastAPI\nAWS"
+
+
+@pytest.mark.parametrize("filter_url, tags", [
+    ("https://remoteok.com/remote-python-jobs", ["python"]),
+    ("https://remoteok.com/remote-python+react-jobs/", ["python", "react"]),
+    ("https://remoteok.com/remote-machine-learning-jobs", ["machine learning"]),
+    ("https://remoteok.com/remote-back%20end-jobs", ["back end"]),
+    ("https://remoteok.com/?tags=Python,Machine_Learning", ["python", "machine learning"]),
+    ("https://remoteok.com/remote-python-jobs?tags=sql", ["python", "sql"]),
+    ("https://remoteok.com/", []),
+])
+def test_tags_from_filter_url(filter_url, tags):
+    assert tags_from_filter_url(filter_url) == tags
+
+
+def test_feed_jobs_are_filtered_by_the_filter_url_tags(recorded_feed):
+    async def scenario():
+        url = "https://remoteok.com/remote-python+machine-learning-jobs"
+        assert await feed.scrape_jobs_from_feed(url, [], 10) == [GLOBEX, HOOLI]
+        assert await feed.scrape_jobs_from_feed(url, [GLOBEX], 10) == [HOOLI]
+        assert await feed.scrape_jobs_from_feed("https://remoteok.com/", [], 2) == [GLOBEX, INITECH]
+
+    asyncio.run(scenario())
+
+
+def test_feed_descriptions_and_titles_skip_empty_fields(recorded_feed):
+    async def scenario():
+        return await feed.feed_descriptions([GLOBEX, HOOLI]), await feed.feed_titles([HOOLI, "https://remoteok.com/x"])
+
+    descriptions, titles = asyncio.run(scenario())
+    assert list(descriptions) == [GLOBEX]
+    assert titles == {HOOLI: "Python Data Engineer"}
+
+
+@pytest.fixture
+def dom_scrape(monkeypatch):
+    calls = []
+
+    async def scrape_jobs_remoteok_browser(filter_url, existing_urls, no_jobs=10):
+        calls.append(filter_url)
+        return ["https://remoteok.com/remote-jobs/from-the-listing-1"]
+
+    monkeypatch.setattr(scrape_jobs_core, "scrape_jobs_remoteok_browser", scrape_jobs_remoteok_browser)
+    return calls
+
+
+def test_feed_mode_uses_the_feed_when_it_has_new_jobs(recorded_feed, dom_scrape):
+    urls = asyncio.run(scrape_jobs_core.scrape_jobs_core_remoteok("https://remoteok.com/remote-react-jobs", [], 5, mode="feed"))
+    assert urls == [INITECH]
+    assert dom_scrape == []
+
+
+def test_feed_mode_falls_back_to_dom_scraping_when_feed_is_exhausted(recorded_feed, dom_scrape):
+    filter_url = "https://remoteok.com/remote-react-jobs"
+    urls = asyncio.run(scrape_jobs_core.scrape_jobs_core_remoteok(filter_url, [INITECH], 5, mode="feed"))
+    assert urls == ["https://remoteok.com/remote-jobs/from-the-listing-1"]
+    assert dom_scrape == [filter_url]
+
+
+def test_feed_mode_falls_back_to_dom_scraping_when_feed_is_down(monkeypatch, dom_scrape):
+    async def get_feed(force=False):
+        raise RuntimeError("503 Service Unavailable")
+
+    monkeypatch.setattr(feed, "get_feed", get_feed)
+    urls = asyncio.run(scrape_jobs_core.scrape_jobs_core_remoteok("https://remoteok.com/", [], 5, mode="feed"))
+    assert urls == ["https://remoteok.com/remote-jobs/from-the-listing-1"]
+    # Enrichment from the feed degrades to nothing instead of failing the scrape.
+    assert asyncio.run(feed.feed_titles(urls)) == {}
@@ -0,0 +1,45 @@
+import numpy as np
+from helpers import similarity_index
+from helpers.similarity_index import SimilarityIndex, sync_similarity_index
+
+
+def unit(*values):
+    vector = np.array(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def test_remove_compacts_rows_and_keeps_search_consistent(monkeypatch):
+    monkeypatch.setattr(similarity_index, "APPROX_MIN_SIZE", 0)
+    index = SimilarityIndex(dim=3)
+    index.upsert(["a", "b", "c"], np.stack([unit(1, 0, 0), unit(0, 1, 0), unit(1, 1, 0)]), ["ka", "kb", "kc"])
+
+    index.remove(["a", "missing"])
+
+    assert index.urls == ["b", "c"]
+    assert index.rows == {"b": 0, "c": 1}
+    assert set(index.keys) == {"b", "c"}
+    for approximate in (False, True):
+        assert [url for url, _ in index.search(unit(1, 0, 0), k=5, approximate=approximate)] == ["c", "b"]
+
+
+def test_sync_drops_jobs_that_left_job_results(monkeypatch):
+    vectors = {"python backend": unit(1, 0, 0), "python api": unit(0.9, 0.1, 0), "rust": unit(0, 0, 1)}
+
+    class Service:
+        def embed_sync(self, texts):
+            return np.stack([vectors[t] for t in texts])
+
+    monkeypatch.setattr(similarity_index, "embedding_service", Service())
+    monkeypatch.setattr(similarity_index, "_indexes", {"agent": SimilarityIndex(dim=3)})
+    job_results = {
+        "https://a": {"description": "python backend"},
+        "https://b": {"description": "python api"},
+        "https://c": {"description": "rust"},
+    }
+    sync_similarity_index("agent", job_results)
+
+    del job_results["https://b"]
+    index = sync_similarity_index("agent", job_results)
+
+    assert index.urls == ["https://a", "https://c"]
+    assert [url for url, _ in index.search(unit(1, 0, 0), k=2, exclude=["https://a"])] == ["https://c"]
@@ -0,0 +1,19 @@
+import pytest
+
+nltk = pytest.importorskip("nltk")
+from helpers import summarize
+
+
+def test_missing_tokenizer_data_raises_instead_of_downloading(monkeypatch):
+    def not_found(resource):
+        raise LookupError(resource)
+
+    def download(*args, **kwargs):
+        pytest.fail("tokenizer data must not be downloaded at runtime")
+
+    monkeypatch.setattr(summarize, "_tokenizer_ready", False)
+    monkeypatch.setattr(nltk.data, "find", not_found)
+    monkeypatch.setattr(nltk, "download", download)
+
+    with pytest.raises(summarize.TokenizerDataMissing, match="python -m helpers.summarize"):
+        summarize.split_sentences("One sentence. Another one.")
@@ -1,5 +1,4 @@
 from langchain_core.tools import tool,InjectedToolCallId
-from playwright.async_api import async_playwright
 from langchain_core.runnables import RunnableConfig
 from langgraph.prebuilt import InjectedState
 from typing import Annotated
@@ -44,7 +43,7 @@ async def auto_apply(
         if not username or not password:
             raise Exception("Missing decrypted credentials.")
 
-        await auto_apply_to_job(job_url, username, password, str(job_data.get("cover_letter", "")))
+        await auto_apply_to_job(job_url, username, password, str(job_data.get("cover_letter", "")), agent_id=thread_id)
 
         # Update state
         updated_results = state.get("job_results", {})
@@ -1,4 +1,3 @@
-import os
 from langchain_core.messages import ToolMessage
 from langgraph.prebuilt import InjectedState
 from langgraph.types import Command
@@ -6,10 +5,9 @@ from langchain_core.tools import tool, InjectedToolCallId
 from langchain_core.runnables import RunnableConfig
 from typing import Annotated
 from utils.types import State
-from helpers.shared import model
-from sentence_transformers import SentenceTransformer, util
-from helpers.supabase import supabase
-from helpers.read_pdf import read_pdf
+import asyncio
+from helpers.embedding_service import embed_texts
+from helpers.resume_cache import get_resume_artifacts
 from helpers.fetch_desc import fetch_desc
 
 @tool(description="Compare a job description (from state using the job URL) with the user's resume and update similarity score.")
@@ -34,22 +32,9 @@ async def compare_job(
 
     try:
         try:
-            # Download resume from Supabase
-            response = (
-                supabase.storage
-                .from_("resumes")
-                .download(resume_path)
-            )
-            # Save temporarily
-            temp_path = f"/tmp/resume-{thread_id}.pdf"
-            with open(temp_path, "wb") as f:
-                f.write(response)
-            # Extract text
-            resume_text = read_pdf(temp_path)
-            # Embed and cache
-            resume_embedding = model.encode(resume_text, convert_to_tensor=True)
-            # Clean up
-            os.remove(temp_path)
+            # Downloaded, parsed and embedded once per stored resume version
+            resume = await asyncio.to_thread(get_resume_artifacts, resume_path)
+            resume_embedding = await resume.embedding()
         except Exception as e:
             return Command(update={
                 "messages": [
@@ -76,8 +61,8 @@ async def compare_job(
                 })
 
         # Compare embeddings
-        job_embedding = model.encode(job_desc, convert_to_tensor=True)
-        similarity = util.cos_sim(resume_embedding, job_embedding).item()
+        job_embedding = (await embed_texts([job_desc]))[0]
+        similarity = float(resume_embedding @ job_embedding)
 
         # Update state
         updated_results = state.get("job_results", {})
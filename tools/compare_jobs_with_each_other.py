@@ -1,54 +1,97 @@
 from langgraph.prebuilt import InjectedState
 from langchain_core.tools import tool, InjectedToolCallId
+from langchain_core.runnables import RunnableConfig
 from typing import Annotated
 from utils.types import State
 from langgraph.types import Command
-from helpers.shared import model
+from helpers.embedding_service import embed_texts
+from helpers.embeddings import similarity_matrix, cluster_by_threshold
 from langchain_core.messages import ToolMessage
-from sentence_transformers import SentenceTransformer, util
-from helpers.fetch_desc import fetch_desc
+from helpers.fetch_desc_bulk import fetch_descs_bulk
 
 
-@tool(description="Compare two job descriptions by URL and return a similarity score between them.")
+def format_matrix(matrix) -> str:
+    labels = [f"#{i + 1}" for i in range(matrix.shape[0])]
+    width = max(5, max(len(label) for label in labels))
+    lines = [" " * width + "".join(f"{label:>{width + 1}}" for label in labels)]
+    for label, row in zip(labels, matrix.tolist()):
+        lines.append(f"{label:>{width}}" + "".join(f"{score:>{width + 1}.2f}" for score in row))
+    return "\n".join(lines)
+
+
+@tool(description="Compare two or more jobs by URL. With two URLs returns their similarity score; with more, returns the pairwise similarity matrix and groups of alike jobs (linked by pairs scoring at least `cluster_threshold`, 0-1). Fetched descriptions are stored inside `job_results` in state.")
 async def compare_jobs_with_each_other(
-    job_url_1: str,
-    job_url_2: str,
+    job_urls: list[str],
+    config: RunnableConfig,
     state: Annotated[State, InjectedState],
-    tool_call_id: Annotated[str, InjectedToolCallId]
+    tool_call_id: Annotated[str, InjectedToolCallId],
+    cluster_threshold: float = 0.75
 ) -> Command:
+    agent_type = config.get("configurable", {}).get("agent_type", "ycombinator")
+    urls = list(dict.fromkeys(u.strip() for u in job_urls if u and u.strip()))
 
-    def get_cached_description(url: str) -> str:
-        return state.get("job_results", {}).get(url, {}).get("description", "")
+    if len(urls) < 2:
+        return Command(update={
+            "messages": [
+                ToolMessage(
+                    content="⚠️ Provide at least two distinct job URLs to compare.",
+                    tool_call_id=tool_call_id
+                )
+            ]
+        })
 
     try:
-        job_desc_1 = get_cached_description(job_url_1)
-        if not job_desc_1:
-            job_desc_1 = await fetch_desc(job_url_1)
+        updated_results = state.get("job_results", {}).copy()
+        descriptions = {url: updated_results.get(url, {}).get("description", "") for url in urls}
 
-        job_desc_2 = get_cached_description(job_url_2)
-        if not job_desc_2:
-            job_desc_2 = await fetch_desc(job_url_2)
+        # Missing descriptions are fetched concurrently; failures are reported, not fatal
+        missing = [url for url, desc in descriptions.items() if not desc]
+        failed: dict[str, Exception] = {}
+        if missing:
+            for url, result in (await fetch_descs_bulk(missing, agent_type)).items():
+                if isinstance(result, Exception):
+                    failed[url] = result
+                else:
+                    descriptions[url] = result
+                    updated_results[url] = {**updated_results.get(url, {}), "description": result}
 
-        # Compute similarity
-        emb_1 = model.encode(job_desc_1, convert_to_tensor=True)
-        emb_2 = model.encode(job_desc_2, convert_to_tensor=True)
-        similarity = util.cos_sim(emb_1, emb_2).item()
+        compared = [url for url in urls if url not in failed]
+        errors = "".join(f"\n⚠️ Could not fetch {url}: {err}" for url, err in failed.items())
+        if len(compared) < 2:
+            return Command(update={
+                "job_results": updated_results,
+                "messages": [
+                    ToolMessage(
+                        content="❌ Not enough job descriptions to compare." + errors,
+                        tool_call_id=tool_call_id
+                    )
+                ]
+            })
 
-        # Update state
-        updated_results = state.get("job_results", {}).copy()
-        for url, desc in [(job_url_1, job_desc_1), (job_url_2, job_desc_2)]:
-            if url not in updated_results:
-                updated_results[url] = {}
-            updated_results[url]["description"] = desc
+        # One batched embedding pass, one matrix product
+        vectors = await embed_texts([descriptions[url] for url in compared])
+        matrix = similarity_matrix(vectors)
+
+        if len(compared) == 2:
+            content = f"✅ Similarity score between the two jobs: {round(float(matrix[0, 1]), 2)}"
+        else:
+            legend = "\n".join(f"#{i + 1}: {url}" for i, url in enumerate(compared))
+            groups = [g for g in cluster_by_threshold(matrix, cluster_threshold) if len(g) > 1]
+            if groups:
+                clusters = "\n".join(
+                    "- " + ", ".join(f"#{i + 1}" for i in group) for group in groups
+                )
+            else:
+                clusters = "- No jobs are alike at this threshold."
+            content = (
+                f"✅ Pairwise similarity of {len(compared)} jobs:\n\n{legend}\n\n"
+                f"{format_matrix(matrix)}\n\n"
+                f"Groups of alike jobs (score ≥ {cluster_threshold}):\n{clusters}"
+            )
 
         return Command(update={
             "job_results": updated_results,
-            "messages": [
-                ToolMessage(
-                    content=f"✅ Similarity score between the two jobs: {round(similarity, 2)}",
-                    tool_call_id=tool_call_id
-                )
-            ]
+            "messages": [ToolMessage(content=content + errors, tool_call_id=tool_call_id)]
         })
 
     except Exception as e:
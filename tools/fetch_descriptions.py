@@ -2,15 +2,16 @@ from langchain_core.messages import ToolMessage
 from langgraph.prebuilt import InjectedState
 from langgraph.types import Command
 from langchain_core.tools import tool, InjectedToolCallId
-from playwright.async_api import async_playwright
 from langchain_core.runnables import RunnableConfig
 from typing import Annotated
 from utils.types import State
 from helpers.fetch_desc import fetch_desc
+from helpers.keyword_index import index_descriptions
 
 @tool(description="Fetch and store the job description for a given job URL.")
 async def fetch_description(
     job_url: str,
+    config: RunnableConfig,
     state: Annotated[State, InjectedState],
     tool_call_id: Annotated[str, InjectedToolCallId]
 ) -> Command:
@@ -21,6 +22,7 @@ async def fetch_description(
         if job_url not in updated_results:
             updated_results[job_url] = {}
         updated_results[job_url]["description"] = description
+        index_descriptions(config.get("configurable", {}).get("thread_id") or "", {job_url: description})
     
         return Command(update={
             "job_results": updated_results,
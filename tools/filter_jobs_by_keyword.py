@@ -1,13 +1,24 @@
 from langchain_core.tools import tool
+from langchain_core.runnables import RunnableConfig
 from langgraph.prebuilt import InjectedState
-from typing import Annotated
+from typing import Annotated, Any
 from utils.types import State
+from helpers.keyword_index import get_keyword_index
 
 
-@tool(description="Filter job descriptions by a given keyword or phrase.")
-def filter_jobs_by_keyword(keyword: str, state: Annotated[State, InjectedState]) -> list[str]:
-    results = []
-    for url, desc in state.get("job_results", {}).items():
-        if keyword.lower() in desc.get("description", "").lower():
-            results.append(url)
-    return results
+@tool(description='Search job descriptions by keyword. Words are AND-ed, `OR` separates alternatives and "quoted text" matches an exact phrase, e.g. `python "machine learning" OR rust`. Returns matching job URLs, best matches first, each with a snippet.')
+def filter_jobs_by_keyword(
+    keyword: str,
+    config: RunnableConfig,
+    state: Annotated[State, InjectedState],
+    limit: int = 20
+) -> list[dict[str, Any]]:
+    thread_id = config.get("configurable", {}).get("thread_id") or ""
+    job_results = state.get("job_results", {})
+
+    # Descriptions written since the last query (or before a restart) are indexed here
+    index = get_keyword_index(thread_id)
+    index.sync(job_results)
+
+    matches = [m for m in index.search(keyword) if m["url"] in job_results]
+    return matches[:limit]
@@ -5,18 +5,24 @@ from langchain_core.tools import tool, InjectedToolCallId
 from langchain_core.runnables import RunnableConfig
 from typing import Annotated
 from utils.types import State
-from helpers.shared import model, job_embedding_store
-from sentence_transformers import util
+import asyncio
+from helpers.embedding_service import embed_texts
+from helpers.similarity_index import sync_similarity_index
 from helpers.fetch_desc import fetch_desc
 
 
-@tool("find_similar_jobs", description="Find jobs similar to a given job using embeddings.")
+@tool("find_similar_jobs", description="Find jobs similar to a given job using embeddings. `k` is the number of matches to return and `min_score` (0-1) drops weaker matches. Set `approximate` for very large job pools.")
 async def find_similar_jobs(
     job_url: str,
+    config: RunnableConfig,
     state: Annotated[State, InjectedState],
-    tool_call_id: Annotated[str, InjectedToolCallId]
+    tool_call_id: Annotated[str, InjectedToolCallId],
+    k: int = 5,
+    min_score: float = 0.0,
+    approximate: bool = False
 ) -> Command:
     try:
+        thread_id = config.get("configurable", {}).get("thread_id") or ""
         job_results = state.get("job_results", {})
 
         # Ensure we have the job description
@@ -24,28 +30,13 @@ async def find_similar_jobs(
         if not target_desc:
             target_desc = await fetch_desc(job_url)
     
-        # Embed target job if not cached
-        if job_url not in job_embedding_store:
-            job_embedding_store[job_url] = model.encode(target_desc, convert_to_tensor=True)
-    
-        target_embedding = job_embedding_store[job_url]
-    
-        # Embed all other jobs and calculate similarity
-        similarities = []
-        for other_url, data in job_results.items():
-            if other_url == job_url or "description" not in data:
-                continue
-    
-            if other_url not in job_embedding_store:
-                job_embedding_store[other_url] = model.encode(data["description"], convert_to_tensor=True)
-    
-            sim_score = util.cos_sim(target_embedding, job_embedding_store[other_url]).item()
-            similarities.append((other_url, sim_score))
-    
-        # Sort by score descending
-        similarities.sort(key=lambda x: x[1], reverse=True)
-    
-        top_matches = similarities[:5]
+        # The agent's index only embeds descriptions it has not seen before
+        index = await asyncio.to_thread(sync_similarity_index, thread_id, job_results)
+        target_embedding = (await embed_texts([target_desc]))[0]
+
+        top_matches = await asyncio.to_thread(
+            index.search, target_embedding, k, min_score, [job_url], approximate
+        )
         content = f"Top {len(top_matches)} similar jobs to {job_url}:\n\n"
         for url, score in top_matches:
             content += f"- {url} (score: {round(score, 2)})\n"
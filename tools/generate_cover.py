@@ -1,28 +1,25 @@
 from dotenv import load_dotenv
-import os
 load_dotenv()
 
 from langchain_core.tools import tool, InjectedToolCallId
 from langchain_core.runnables import RunnableConfig
-from helpers.summarize import summarize_text
-from langchain_google_vertexai import ChatVertexAI
 from typing import Annotated
 from langgraph.prebuilt import InjectedState
 from utils.types import State
 from langgraph.types import Command
 from langchain_core.messages import ToolMessage
-from helpers.supabase import supabase
-from helpers.shared import resume_text_cache
-from helpers.read_pdf import read_pdf
+import asyncio
+from helpers.resume_cache import get_resume_artifacts
 from helpers.fetch_desc import fetch_desc
 from helpers.generate_cover_letter_for_job import generate_cover_letter_for_job
 
-@tool(description="Generate a tailored cover letter using the user's resume and a given job url. Stores the generated cover letter inside `job_results` in state.")
+@tool(description="Generate a tailored cover letter using the user's resume and a given job url. Stores the generated cover letter inside `job_results` in state. A letter previously generated for the same resume and description is reused unless `force_regenerate` is set.")
 async def generate_cover(
     job_url: str,
     config: RunnableConfig,
     state: Annotated[State, InjectedState],
-    tool_call_id: Annotated[str, InjectedToolCallId]
+    tool_call_id: Annotated[str, InjectedToolCallId],
+    force_regenerate: bool = False
 ) -> Command:
     thread_id = config.get("configurable", {}).get("thread_id")
     resume_path = config.get("configurable", {}).get("resume_path", "")
@@ -38,22 +35,17 @@ async def generate_cover(
         })
 
     try:
-        # Load or cache resume text
-        if thread_id not in resume_text_cache:
-            response = supabase.storage.from_("resumes").download(resume_path)
-            temp_path = f"/tmp/resume-{thread_id}.pdf"
-            with open(temp_path, "wb") as f:
-                f.write(response)
-            resume_text_cache[thread_id] = read_pdf(temp_path)
-            os.remove(temp_path)
-
-        resume_text = resume_text_cache[thread_id]
+        # Downloaded, parsed and summarized once per stored resume version
+        resume = await asyncio.to_thread(get_resume_artifacts, resume_path)
+        resume_summary = await asyncio.to_thread(resume.summary, 10)
         job_description = state.get("job_results", {}).get(job_url, {}).get("description")
 
         if not job_description:
             job_description = await fetch_desc(job_url)
 
-        cover_letter = await generate_cover_letter_for_job(job_url, resume_text, job_description)
+        cover_letter = await generate_cover_letter_for_job(
+            job_url, resume.text, job_description, summarized_resume=resume_summary, force_regenerate=force_regenerate
+        )
 
         # Update state
         job_results = state.get("job_results", {})
@@ -1,5 +1,4 @@
 from langchain_core.tools import tool,InjectedToolCallId
-from playwright.async_api import async_playwright
 from langchain_core.runnables import RunnableConfig
 from langgraph.prebuilt import InjectedState
 from typing import Annotated
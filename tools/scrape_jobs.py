@@ -2,7 +2,6 @@ from langchain_core.messages import ToolMessage
 from langgraph.prebuilt import InjectedState
 from langgraph.types import Command
 from langchain_core.tools import tool, InjectedToolCallId
-from playwright.async_api import async_playwright
 from langchain_core.runnables import RunnableConfig
 from typing import Annotated
 from utils.types import State
@@ -19,7 +18,8 @@ async def scrape_jobs(
     no_jobs: int = 10
 ) -> Command:
     try:
-        creds_res = supabase.table("encrypted_credentials_yc").select("*").eq("agent_id", config.get("configurable", {}).get("thread_id") or "").single().execute()
+        thread_id = config.get("configurable", {}).get("thread_id") or ""
+        creds_res = supabase.table("encrypted_credentials_yc").select("*").eq("agent_id", thread_id).single().execute()
         if getattr(creds_res, "error", None) or not creds_res.data:
             raise Exception("Could not fetch credentials")
 
@@ -33,17 +33,17 @@ async def scrape_jobs(
         filter_url = config.get("configurable", {}).get("filter_url", "")
         seen_urls = list(state.get("job_results", {}).keys())
 
-        new_urls = await scrape_jobs_core(username, password, filter_url, seen_urls, no_jobs)
+        new_jobs = await scrape_jobs_core(username, password, filter_url, seen_urls, no_jobs, agent_id=thread_id)
 
         updated_results = state.get("job_results", {})
-        for url in new_urls:
-            updated_results[url] = {}
+        for url, title in new_jobs.items():
+            updated_results[url] = {"title": title} if title else {}
 
         return Command(update={
             "job_results": updated_results,
             "messages": [
                 ToolMessage(
-                    content=f"✅ Scraped {len(new_urls)} new job(s).",
+                    content=f"✅ Scraped {len(new_jobs)} new job(s).",
                     tool_call_id=tool_call_id
                 )
             ]
@@ -4,12 +4,14 @@ from langchain_core.messages import BaseMessage, ToolMessage
 from langgraph.graph.message import add_messages
 
 class JobResult(TypedDict, total=False):
+    title: str
     description: str
     score: Optional[float]
     cover_letter: Optional[str]
     apply_decision: Optional[bool]
     applied: Optional[bool]
     suitable: Optional[bool]
+    duplicate_of: Optional[str]
 
 def merge_job_results(
     left: dict[str, JobResult], right: dict[str, JobResult]
@@ -29,4 +31,5 @@ class State(TypedDict, total=False):
     suitable_jobs_scraped_or_applied_in_current_run: list[str]
     started_at: str
     ended_at: str
-    not_enough_urls: bool
\ No newline at end of file
+    not_enough_urls: bool
+    login_error: Optional[str]
\ No newline at end of file